@@ -1,62 +1,51 @@
-
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 from app.auth import verify_token
-# Import the orchestrator script
-# Note: We need to import main from script. Use relative import or sys.path
-import sys
-import os
-from datetime import datetime
-
-# Ensure backend root is in path to import scripts
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-from scripts.ingest_v2 import main as run_ingestion
+from app.database import get_db
+from app.models import pydantic_models
+from app import jobs, rebuild
 
 router = APIRouter()
 
-# In-memory status tracker
-INGESTION_STATUS = {
-    "status": "idle",  # idle | running | completed | failed
-    "lastRun": None,
-    "lastCompleted": None,
-    "error": None
-}
-
-def update_status(new_status: str, error: str = None):
-    INGESTION_STATUS["status"] = new_status
-    INGESTION_STATUS["lastRun"] = datetime.utcnow().isoformat()
-    if new_status == "completed":
-        INGESTION_STATUS["lastCompleted"] = datetime.utcnow().isoformat()
-        INGESTION_STATUS["error"] = None
-    elif new_status == "failed":
-        INGESTION_STATUS["error"] = error
-
-def run_ingestion_with_status():
-    """Wrapper to track ingestion status"""
-    update_status("running")
-    try:
-        run_ingestion()
-        update_status("completed")
-    except Exception as e:
-        update_status("failed", str(e))
-        print(f"Ingestion failed: {e}")
+def serialize_job(job):
+    """Status payload polled by the admin Ingest button, plus per-stage progress."""
+    if not job:
+        return {"status": "idle", "lastRun": None, "lastCompleted": None, "error": None, "job": None}
+    return {
+        "status": job.status,  # queued | running | completed | failed
+        "lastRun": (job.started_at or job.created_at).isoformat(),
+        "lastCompleted": job.finished_at.isoformat() if job.status == "completed" and job.finished_at else None,
+        "error": job.error,
+        "job": pydantic_models.IngestionJob.model_validate(job).model_dump(mode="json")
+    }
 
 @router.get("/ingest/status")
-async def get_ingestion_status(user=Depends(verify_token)):
-    """Get current ingestion status"""
-    return INGESTION_STATUS
+def get_ingestion_status(db: Session = Depends(get_db), user=Depends(verify_token)):
+    """Get status of the latest ingestion job (shared by all web workers via the DB)"""
+    return serialize_job(jobs.latest_job(db))
 
-@router.post("/ingest")
-async def trigger_ingestion(background_tasks: BackgroundTasks, user=Depends(verify_token)):
+@router.post("/ingest", status_code=status.HTTP_202_ACCEPTED)
+def trigger_ingestion(full: bool = False, db: Session = Depends(get_db), user=Depends(verify_token)):
     """
-    Triggers the Knowledge Base Ingestion in the background.
+    Queues a Knowledge Base Ingestion job for the ingestion worker process.
+    Incremental by default (only changed chunks are re-embedded); ?full=true rebuilds everything.
     Protected by Admin Token.
     """
-    if INGESTION_STATUS["status"] == "running":
-        raise HTTPException(status_code=409, detail="Ingestion already in progress")
-    
     try:
-        # Run ingestion in background with status tracking
-        background_tasks.add_task(run_ingestion_with_status)
-        return {"message": "Knowledge Base Ingestion started in background."}
+        job = jobs.enqueue_ingestion(db, full=full)
+    except jobs.JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Knowledge Base Ingestion queued.", **serialize_job(job)}
+
+@router.get("/rebuild/status")
+def get_rebuild_status(db: Session = Depends(get_db), user=Depends(verify_token)):
+    """Pending (coalesced) site rebuild, last dispatch, and the latest GitHub Actions run"""
+    return rebuild.rebuild_status(db)
+
+@router.post("/rebuild", status_code=status.HTTP_202_ACCEPTED)
+def trigger_rebuild(db: Session = Depends(get_db), user=Depends(verify_token)):
+    """Requests a site rebuild; dispatched after the quiet window like any content change."""
+    rebuild.request_rebuild(db, "manual")
+    return {"message": "Site rebuild requested.", **rebuild.rebuild_status(db)}
@@ -1,57 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import IntegrityError
-from typing import List
-from datetime import datetime
-import os
-import requests
+from typing import List, Literal, Optional
 
 from app.database import get_db
+from app.auth import verify_token
 from app.models import schemas, pydantic_models
-from app.utils import delete_cloudinary_image
-
-# GitHub Auto-Rebuild Configuration
-GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-GITHUB_REPO_OWNER = 'smaxiso'
-GITHUB_REPO_NAME = 'smaxiso.github.io'
-
-def trigger_github_rebuild():
-    """Trigger GitHub Actions to rebuild and deploy the site"""
-    if not GITHUB_TOKEN:
-        print("WARNING: GITHUB_TOKEN not set, skipping auto-rebuild")
-        return
-    
-    try:
-        url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/dispatches"
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "Authorization": f"token {GITHUB_TOKEN}"
-        }
-        data = {"event_type": "rebuild-blog"}
-        
-        response = requests.post(url, headers=headers, json=data, timeout=10)
-        
-        if response.status_code == 204:
-            print("✅ GitHub Actions rebuild triggered successfully")
-        else:
-            print(f"⚠️ GitHub trigger failed with status {response.status_code}: {response.text}")
-    except Exception as e:
-        print(f"❌ Error triggering GitHub rebuild: {e}")
+from app.utils import delete_cloudinary_image, find_content_images
+from app import media_refs, rebuild, http_cache
+from app.pagination import paginate
+from app.timestamps import utcnow
 
 router = APIRouter()
 
-# Public: Get all published posts
-@router.get("/", response_model=List[pydantic_models.BlogPost])
-def read_published_posts(limit: int = 50, db: Session = Depends(get_db)):
-    posts = db.query(schemas.BlogPost)\
-        .filter(schemas.BlogPost.published == True)\
-        .order_by(schemas.BlogPost.created_at.desc())\
-        .limit(limit)\
-        .all()
-    return posts
+cache_posts = http_cache.HttpCache(schemas.BlogPost)
+# The popular listing carries reaction totals, which the reaction flusher versions separately
+cache_popular = http_cache.HttpCache(schemas.BlogPost, http_cache.REACTION_TOTALS)
+
+def cache_listing(request: Request, response: Response, sort: Literal["recent", "popular"] = "recent"):
+    (cache_popular if sort == "popular" else cache_posts)(request, response)
+
+Post = schemas.BlogPost
+# Listings never load the Markdown body; read_post_by_slug serves it
+SUMMARY_COLUMNS = load_only(Post.id, Post.title, Post.slug, Post.excerpt, Post.tags,
+                            Post.cover_image, Post.published, Post.created_at, Post.updated_at,
+                            Post.reaction_total, Post.reaction_counts)
+# The date-ordered listing is validated without the reaction totals version, so it leaves them out
+NO_REACTION_TOTALS = {"reaction_total": None, "reaction_counts": None}
+# Keyset: newest first, id breaks ties between posts created in the same instant
+SORT_COLUMNS = (Post.created_at, Post.id)
+# ?sort=popular: most reactions first (ix_blog_posts_published_popular), then newest
+POPULAR_SORT_COLUMNS = (Post.reaction_total, Post.created_at, Post.id)
+
+def sort_key(post):
+    return post.created_at, post.id
+
+def popular_sort_key(post):
+    return post.reaction_total, post.created_at, post.id
+
+# Public: Get published posts (newest first, or most reactions first with ?sort=popular;
+# only the latter includes reaction totals). Pass the X-Next-Cursor header back as ?cursor= for the next page
+@router.get("/", response_model=List[pydantic_models.BlogPostSummary], dependencies=[Depends(cache_listing)])
+def read_published_posts(
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: Literal["recent", "popular"] = "recent",
+    db: Session = Depends(get_db)
+):
+    query = db.query(Post).options(SUMMARY_COLUMNS).filter(Post.published == True)
+    if sort == "popular":
+        return paginate(query, POPULAR_SORT_COLUMNS, cursor, limit, response, popular_sort_key)
+    posts = paginate(query, SORT_COLUMNS, cursor, limit, response, sort_key)
+    return [pydantic_models.BlogPostSummary.model_validate(p).model_copy(update=NO_REACTION_TOTALS) for p in posts]
 
 # Public: Get single post by slug
-@router.get("/{slug}", response_model=pydantic_models.BlogPost)
+@router.get("/{slug}", response_model=pydantic_models.BlogPost, dependencies=[Depends(cache_posts)])
 def read_post_by_slug(slug: str, db: Session = Depends(get_db)):
     post = db.query(schemas.BlogPost).filter(schemas.BlogPost.slug == slug).first()
     if not post:
@@ -66,13 +70,26 @@ def read_post_by_slug(slug: str, db: Session = Depends(get_db)):
         pass 
     return post
 
-# Admin: Get all posts (published + drafts)
-@router.get("/admin/all", response_model=List[pydantic_models.BlogPost])
-def read_all_posts(db: Session = Depends(get_db)):
-    posts = db.query(schemas.BlogPost)\
-        .order_by(schemas.BlogPost.created_at.desc())\
-        .all()
-    return posts
+# Admin: Get all posts (published + drafts). Unpaged unless ?limit= is given
+@router.get("/admin/all", response_model=List[pydantic_models.BlogPostSummary])
+def read_all_posts(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    query = db.query(Post).options(SUMMARY_COLUMNS)
+    return paginate(query, SORT_COLUMNS, cursor, limit, response, sort_key)
+
+# Admin: Get one post (with content) for the editor. Never cached: reopening a post
+# right after saving must not show, and then re-save, the old body
+@router.get("/admin/{id}", response_model=pydantic_models.BlogPost)
+def read_post_for_editing(id: int, response: Response, db: Session = Depends(get_db), user=Depends(verify_token)):
+    post = db.query(schemas.BlogPost).filter(schemas.BlogPost.id == id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    response.headers["Cache-Control"] = "private, no-store"
+    return post
 
 # Admin: Create Post
 @router.post("/", response_model=pydantic_models.BlogPost)
@@ -82,7 +99,7 @@ def create_post(post: pydantic_models.BlogPostCreate, db: Session = Depends(get_
     if existing:
         raise HTTPException(status_code=400, detail="Slug already exists")
 
-    current_time = datetime.utcnow().isoformat()
+    current_time = utcnow().isoformat()
     try:
         db_post = schemas.BlogPost(
             title=post.title,
@@ -96,6 +113,9 @@ def create_post(post: pydantic_models.BlogPostCreate, db: Session = Depends(get_
             updated_at=current_time
         )
         db.add(db_post)
+        db.flush()
+        media_refs.index_post(db, db_post)
+        http_cache.bump(db, schemas.BlogPost)
         db.commit()
         db.refresh(db_post)
     except IntegrityError as e:
@@ -107,7 +127,7 @@ def create_post(post: pydantic_models.BlogPostCreate, db: Session = Depends(get_
     
     # Trigger rebuild ONLY if published (affects public site)
     if post.published:
-        trigger_github_rebuild()
+        rebuild.request_rebuild(db, f"blog: published {db_post.slug}")
     
     return db_post
 
@@ -134,16 +154,18 @@ def update_post(id: int, post: pydantic_models.BlogPostCreate, db: Session = Dep
     # Handle Image Replacement
     if post.cover_image != db_post.cover_image:
         if db_post.cover_image:
-            delete_cloudinary_image(db_post.cover_image)
+            delete_cloudinary_image(db, db_post.cover_image)
         db_post.cover_image = post.cover_image
 
     # Store original published state before update
     was_published = db_post.published
     
     db_post.published = post.published
-    db_post.updated_at = datetime.utcnow().isoformat()
+    db_post.updated_at = utcnow().isoformat()
+    media_refs.index_post(db, db_post)
     
     try:
+        http_cache.bump(db, schemas.BlogPost)
         db.commit()
         db.refresh(db_post)
     except IntegrityError as e:
@@ -159,7 +181,7 @@ def update_post(id: int, post: pydantic_models.BlogPostCreate, db: Session = Dep
     should_rebuild = post.published or (was_published and not post.published)
     
     if should_rebuild:
-        trigger_github_rebuild()
+        rebuild.request_rebuild(db, f"blog: updated {db_post.slug}")
     
     return db_post
 
@@ -172,25 +194,19 @@ def delete_post(id: int, db: Session = Depends(get_db)):
     
     # Delete associated image from Cloudinary
     if db_post.cover_image:
-        delete_cloudinary_image(db_post.cover_image)
+        delete_cloudinary_image(db, db_post.cover_image)
 
     # Delete images used within content
-    if db_post.content:
-        import re
-        # Regex to find markdown images: ![alt](url) or <img src="url">
-        url_pattern = re.compile(r'(?:!\[.*?\]\((https?://[^)]+)\))|(?:src=["\'](https?://[^"\']+)["\'])')
-        matches = url_pattern.findall(db_post.content)
-        
-        for match in matches:
-            # Match returns tuple (markdown_url, html_url), filter empty
-            img_url = next((m for m in match if m), None)
-            if img_url:
-                delete_cloudinary_image(img_url)
+    for img_url in find_content_images(db_post.content):
+        delete_cloudinary_image(db, img_url)
 
+    slug = db_post.slug
+    media_refs.remove_entity(db, "blog_post", db_post.id)
     db.delete(db_post)
+    http_cache.bump(db, schemas.BlogPost)
     db.commit()
     
     # Always trigger rebuild on delete (post might have been published)
-    trigger_github_rebuild()
+    rebuild.request_rebuild(db, f"blog: deleted {slug}")
     
     return {"message": "Post deleted"}
@@ -1,18 +1,24 @@
 
-import os
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import google.generativeai as genai
-from pinecone import Pinecone
 from dotenv import load_dotenv
+from app.vector_store import get_retriever, read_index_version, RETRIEVAL_BACKEND
+from app.response_cache import response_cache
+from app.embedding_cache import embedding_cache
+from app.clients import configure_gemini, get_gemini_model
+from app.intent import classify_intent
+from app.rate_limit import RateLimit
 
 router = APIRouter()
 
 # Load environment variables
 load_dotenv()
 
-INDEX_NAME = "portfolio-index"
+SCORE_THRESHOLD = 0.35
 
 class Message(BaseModel):
     role: str
@@ -25,14 +31,12 @@ class ChatRequest(BaseModel):
 def get_intent(query: str):
     """
     Uses a tiny, fast prompt to detect the user's intent category.
+    Fallback for app.intent.classify_intent when the centroid match is not confident.
     Returns: 'project', 'blog', 'skills', 'resume', or None (general).
     """
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key: return None
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
+        model = get_gemini_model()
+        if not model: return None
         
         prompt = f"""
         Analyze this user question and classify it into ONE of these categories: 
@@ -54,108 +58,135 @@ def get_intent(query: str):
         print(f"⚠️ Intent detection error: {e}")
         return None
 
+EMBEDDING_MODEL = "models/text-embedding-004"
+
 def get_embedding(text: str):
-    """Generates a 768-dimensional embedding using Gemini."""
+    """Generates a 768-dimensional embedding using Gemini (cached by normalized text)."""
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key: return None
-        genai.configure(api_key=api_key)
+        cache_key = embedding_cache.make_key(text, EMBEDDING_MODEL, "retrieval_query")
+        cached = embedding_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if not configure_gemini(): return None
         
         result = genai.embed_content(
-            model="models/text-embedding-004",
+            model=EMBEDDING_MODEL,
             content=text,
             task_type="retrieval_query"
         )
-        return result.get('embedding')
+        embedding = result.get('embedding')
+        if embedding:
+            embedding_cache.put(cache_key, embedding)
+        return embedding
     except Exception as e:
         print(f"❌ Embedding error: {e}")
         return None
 
-def generate_stream(prompt: str):
-    """Streams the response from Gemini."""
+def generate_stream(prompt: str, on_complete=None):
+    """
+    Streams the response from Gemini.
+    on_complete receives the streamed chunks once generation finished without errors.
+    """
     try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        model = get_gemini_model()
+        if not model:
             yield "Error: Gemini API key not configured."
             return
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
         response = model.generate_content(prompt, stream=True)
+        chunks = []
         for chunk in response:
             if chunk.text:
+                chunks.append(chunk.text)
                 yield chunk.text
+        if on_complete and chunks:
+            on_complete(chunks)
     except Exception as e:
         print(f"❌ Stream generation error: {e}")
         yield f"Sorry, I encountered an error during generation: {str(e)}"
 
-# In-memory rate limiter
-RATE_LIMITS = {}
-RATE_LIMIT_DURATION = 60 
-RATE_LIMIT_MAX_REQUESTS = 15 
-
-def check_rate_limit(request: Request):
-    client_ip = request.client.host if request.client else "unknown"
-    now = __import__("time").time()
-    if client_ip not in RATE_LIMITS: RATE_LIMITS[client_ip] = []
-    RATE_LIMITS[client_ip] = [t for t in RATE_LIMITS[client_ip] if now - t < RATE_LIMIT_DURATION]
-    if len(RATE_LIMITS[client_ip]) >= RATE_LIMIT_MAX_REQUESTS:
-        raise HTTPException(status_code=429, detail="Rate limit exceeded.")
-    RATE_LIMITS[client_ip].append(now)
-
-@router.post("/chat")
-async def chat_endpoint(request: ChatRequest, req: Request):
+def retrieve_context(query_vector: list[float], intent: str | None) -> str:
+    """Queries the retrieval backend and joins the matches above the score threshold."""
+    try:
+        retriever = get_retriever()
+        if not retriever:
+            return ""
+
+        # Apply metadata filter if intent was detected
+        matches = retriever.query(
+            query_vector,
+            top_k=5, # Slightly more for better coverage
+            type_filter=intent
+        )
+
+        context_parts = []
+        for match in matches:
+            # 0.35 threshold is safer for Gemini 004
+            if match.score > SCORE_THRESHOLD:
+                text = match.metadata.get("text", "")
+                context_parts.append(f"---\n{text}\n---")
+
+        context_str = "\n".join(context_parts)
+        if context_str:
+            print(f"🧠 Retrieved {len(context_parts)} context chunks (Filter: {intent if intent else 'None'})")
+        return context_str
+    except Exception as retrieval_err:
+        print(f"⚠️ Retrieval error ({RETRIEVAL_BACKEND}): {retrieval_err}")
+        return ""
+
+# 15 messages per minute per client, shared across workers
+chat_rate_limit = RateLimit("chat", max_requests=15, period=60)
+
+@router.post("/chat", dependencies=[Depends(chat_rate_limit)])
+async def chat_endpoint(request: ChatRequest):
+    intent_task = None
     try:
-        check_rate_limit(req)
         user_query = request.message
         context_str = ""
-        
-        # 1. Detect Intent for Filtering
-        intent = get_intent(user_query)
+
+        # The LLM intent fallback starts speculatively, in parallel with the embedding, so a
+        # non-confident centroid match doesn't add a second round trip. It is dropped when the
+        # centroid match is confident (the thread finishes in the background; its result is ignored).
+        intent_task = asyncio.create_task(run_in_threadpool(get_intent, user_query))
+
+        # 1. Embed the query. The blocking SDK call runs in the threadpool so the
+        # event loop stays free for other requests (/health, blog, ...).
+        query_vector = await run_in_threadpool(get_embedding, user_query)
+
+        # Replay a cached answer to a near-identical question. Only standalone
+        # questions are cached, since conversation history changes the answer.
+        kb_version = read_index_version()
+        cacheable = query_vector is not None and not request.history
+        if cacheable:
+            cached_chunks = response_cache.get(query_vector, kb_version)
+            if cached_chunks is not None:
+                print("⚡ Semantic cache hit")
+                intent_task.cancel()
+                return StreamingResponse(iter(cached_chunks), media_type="text/plain")
+
+        # 2. Detect Intent for Filtering: nearest knowledge-base centroid first,
+        # the LLM classifier only when that is not confident
+        # First use loads the local index and computes centroids, so keep it off the event loop too
+        intent, confident = await run_in_threadpool(classify_intent, query_vector) if query_vector else (None, False)
+        if confident:
+            intent_task.cancel()
+        else:
+            intent = await intent_task
         if intent:
-            print(f"🎯 Detected Intent: {intent}")
-
-        # 2. Attempt Context Retrieval (RAG)
-        pinecone_key = os.getenv("PINECONE_API_KEY")
-        if pinecone_key:
-            try:
-                pc = Pinecone(api_key=pinecone_key)
-                query_vector = get_embedding(user_query)
-                
-                if query_vector:
-                    index = pc.Index(INDEX_NAME)
-                    
-                    # Apply metadata filter if intent was detected
-                    filter_obj = {"type": {"$eq": intent}} if intent else None
-                    
-                    results = index.query(
-                        vector=query_vector,
-                        top_k=5, # Slightly more for better coverage
-                        include_metadata=True,
-                        filter=filter_obj
-                    )
-                    
-                    context_parts = []
-                    for match in results.matches:
-                        # 0.35 threshold is safer for Gemini 004
-                        if match.score > 0.35:
-                            meta = match.metadata
-                            text = meta.get("text", "")
-                            context_parts.append(f"---\n{text}\n---")
-                    
-                    context_str = "\n".join(context_parts)
-                    if context_str:
-                        print(f"🧠 Retrieved {len(context_parts)} context chunks (Filter: {intent if intent else 'None'})")
-            except Exception as pine_err:
-                print(f"⚠️ Pinecone error: {pine_err}")
+            print(f"🎯 Detected Intent: {intent} ({'centroid' if confident else 'LLM'})")
+
+        # 3. Attempt Context Retrieval (RAG)
+        if query_vector:
+            context_str = await run_in_threadpool(retrieve_context, query_vector, intent)
         
-        # 3. History String
+        # 4. History String
         history_str = ""
         if request.history:
             recent_history = request.history[-6:] 
             history_str = "\n".join([f"{msg.role.upper()}: {msg.content}" for msg in recent_history])
         
-        # 4. Final Prompt
+        # 5. Final Prompt
         system_prompt = f"""
         You are 'AI Sumit', a virtual assistant for Sumit Kumar's portfolio.
         Your goal is to answer questions about Sumit's skills, projects, and background.
@@ -176,10 +207,16 @@ async def chat_endpoint(request: ChatRequest, req: Request):
         Answer:
         """
 
-        return StreamingResponse(generate_stream(system_prompt), media_type="text/plain")
+        # An answer written without context (nothing matched, or retrieval failed) is not
+        # replayed: the next identical question may well retrieve something
+        cacheable = cacheable and bool(context_str)
+        on_complete = (lambda chunks: response_cache.put(query_vector, kb_version, chunks)) if cacheable else None
+        return StreamingResponse(generate_stream(system_prompt, on_complete), media_type="text/plain")
 
     except Exception as e:
         print(f"🔥 Critical Chat Error: {e}")
+        if intent_task:
+            intent_task.cancel()
         def error_fallback():
             yield "I'm having a little trouble connecting to my brain right now. Please try again in a moment."
         return StreamingResponse(error_fallback(), media_type="text/plain")
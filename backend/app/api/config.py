@@ -4,12 +4,23 @@ from app.database import get_db
 from app.models import schemas, pydantic_models
 from typing import List
 from app.auth import verify_token
+from app import media_refs, rebuild, http_cache
+from app.content_cache import ContentCache
 
 router = APIRouter()
 
+cache_config = http_cache.HttpCache(schemas.SiteConfig)
+cache_socials = http_cache.HttpCache(schemas.SocialLink)
+cache_resumes = http_cache.HttpCache(schemas.ResumeFile)
+config_content: ContentCache[pydantic_models.SiteConfig] = ContentCache(schemas.SiteConfig)
+socials_content: ContentCache[List[pydantic_models.SocialLink]] = ContentCache(schemas.SocialLink)
+
 # --- Config ---
-@router.get("/config", response_model=pydantic_models.SiteConfig)
+@router.get("/config", response_model=pydantic_models.SiteConfig, dependencies=[Depends(cache_config)])
 def get_site_config(db: Session = Depends(get_db)):
+    return config_content.get("config", lambda: pydantic_models.SiteConfig.model_validate(load_site_config(db)))
+
+def load_site_config(db: Session):
     config = db.query(schemas.SiteConfig).filter(schemas.SiteConfig.id == 1).first()
     if not config:
         # Auto-seed a basic config if it's missing
@@ -20,6 +31,7 @@ def get_site_config(db: Session = Depends(get_db)):
             subtitle="Building the future of software with AI"
         )
         db.add(new_config)
+        http_cache.bump(db, schemas.SiteConfig)
         db.commit()
         db.refresh(new_config)
         return new_config
@@ -34,21 +46,29 @@ def update_site_config(config: pydantic_models.SiteConfigUpdate, db: Session = D
     else:
         for key, value in config.model_dump().items():
             setattr(db_config, key, value)
+    media_refs.index_config(db, db_config)
     
+    http_cache.bump(db, schemas.SiteConfig)
     db.commit()
+    rebuild.request_rebuild(db, "config: updated site config")
     db.refresh(db_config)
     return db_config
 
 # --- Socials ---
-@router.get("/socials", response_model=List[pydantic_models.SocialLink])
+@router.get("/socials", response_model=List[pydantic_models.SocialLink], dependencies=[Depends(cache_socials)])
 def get_socials(db: Session = Depends(get_db)):
-    return db.query(schemas.SocialLink).filter(schemas.SocialLink.is_active == 1).all()
+    def load():
+        socials = db.query(schemas.SocialLink).filter(schemas.SocialLink.is_active == 1).all()
+        return [pydantic_models.SocialLink.model_validate(s) for s in socials]
+    return socials_content.get("active", load)
 
 @router.post("/socials", response_model=pydantic_models.SocialLink)
 def create_social(social: pydantic_models.SocialLinkCreate, db: Session = Depends(get_db), user=Depends(verify_token)):
     db_social = schemas.SocialLink(**social.model_dump())
     db.add(db_social)
+    http_cache.bump(db, schemas.SocialLink)
     db.commit()
+    rebuild.request_rebuild(db, "config: created social link")
     db.refresh(db_social)
     return db_social
 
@@ -61,7 +81,9 @@ def update_social(id: int, social: pydantic_models.SocialLinkCreate, db: Session
     for key, value in social.model_dump().items():
         setattr(db_social, key, value)
         
+    http_cache.bump(db, schemas.SocialLink)
     db.commit()
+    rebuild.request_rebuild(db, "config: updated social link")
     db.refresh(db_social)
     return db_social
 
@@ -72,11 +94,13 @@ def delete_social(id: int, db: Session = Depends(get_db), user=Depends(verify_to
         raise HTTPException(status_code=404, detail="Social link not found")
         
     db.delete(db_social)
+    http_cache.bump(db, schemas.SocialLink)
     db.commit()
+    rebuild.request_rebuild(db, "config: deleted social link")
     return {"message": "Deleted successfully"}
 
 # --- Resumes ---
-@router.get("/resumes", response_model=List[pydantic_models.ResumeFile])
+@router.get("/resumes", response_model=List[pydantic_models.ResumeFile], dependencies=[Depends(cache_resumes)])
 def get_resumes(db: Session = Depends(get_db)):
     return db.query(schemas.ResumeFile).all()
 
@@ -89,7 +113,9 @@ def create_resume(resume: pydantic_models.ResumeCreate, db: Session = Depends(ge
     
     db_resume = schemas.ResumeFile(**resume.model_dump())
     db.add(db_resume)
+    http_cache.bump(db, schemas.ResumeFile)
     db.commit()
+    rebuild.request_rebuild(db, "config: created resume")
     db.refresh(db_resume)
     return db_resume
 
@@ -110,7 +136,9 @@ def update_resume(id: int, resume: pydantic_models.ResumeCreate, db: Session = D
     for key, value in resume.model_dump().items():
         setattr(db_resume, key, value)
     
+    http_cache.bump(db, schemas.ResumeFile, schemas.SiteConfig)
     db.commit()
+    rebuild.request_rebuild(db, "config: updated resume")
     db.refresh(db_resume)
     return db_resume
 
@@ -121,6 +149,8 @@ def delete_resume(id: int, db: Session = Depends(get_db), user=Depends(verify_to
         raise HTTPException(status_code=404, detail="Resume not found")
     
     db.delete(db_resume)
+    http_cache.bump(db, schemas.ResumeFile)
     db.commit()
+    rebuild.request_rebuild(db, "config: deleted resume")
     return {"message": "Deleted successfully"}
 
@@ -5,9 +5,13 @@ from pydantic import BaseModel
 from app.database import get_db
 from app.models import schemas
 from app.auth import verify_token
+from app import media_refs, rebuild, http_cache
+from app.content_cache import ContentCache
 
 router = APIRouter()
 
+cache_experiences = http_cache.HttpCache(schemas.Experience)
+
 # Pydantic models for request/response
 class ExperienceBase(BaseModel):
     company: str
@@ -32,14 +36,19 @@ class ExperienceResponse(ExperienceBase):
         from_attributes = True
 
 
+experiences_content: ContentCache[List[ExperienceResponse]] = ContentCache(schemas.Experience)
+
+
 # Public endpoint - Get all experiences
-@router.get("/", response_model=List[ExperienceResponse])
+@router.get("/", response_model=List[ExperienceResponse], dependencies=[Depends(cache_experiences)])
 def get_experiences(db: Session = Depends(get_db)):
     """
     Get all work experiences, ordered by custom order field (ascending)
     """
-    experiences = db.query(schemas.Experience).order_by(schemas.Experience.order).all()
-    return experiences
+    def load():
+        experiences = db.query(schemas.Experience).order_by(schemas.Experience.order).all()
+        return [ExperienceResponse.model_validate(e) for e in experiences]
+    return experiences_content.get("all", load)
 
 
 # Admin endpoint - Create experience
@@ -54,8 +63,12 @@ def create_experience(
     """
     db_experience = schemas.Experience(**experience.dict())
     db.add(db_experience)
+    db.flush()
+    media_refs.index_experience(db, db_experience)
+    http_cache.bump(db, schemas.Experience)
     db.commit()
     db.refresh(db_experience)
+    rebuild.request_rebuild(db, f"experience: created {db_experience.company}")
     return db_experience
 
 
@@ -76,9 +89,12 @@ def update_experience(
     
     for key, value in experience.dict().items():
         setattr(db_experience, key, value)
+    media_refs.index_experience(db, db_experience)
     
+    http_cache.bump(db, schemas.Experience)
     db.commit()
     db.refresh(db_experience)
+    rebuild.request_rebuild(db, f"experience: updated {db_experience.company}")
     return db_experience
 
 
@@ -96,6 +112,9 @@ def delete_experience(
     if not db_experience:
         raise HTTPException(status_code=404, detail="Experience not found")
     
+    media_refs.remove_entity(db, "experience", db_experience.id)
     db.delete(db_experience)
+    http_cache.bump(db, schemas.Experience)
     db.commit()
+    rebuild.request_rebuild(db, f"experience: deleted {experience_id}")
     return {"message": "Experience deleted successfully"}
@@ -1,44 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Literal, Optional
 from app.database import get_db
 from app.models import schemas, pydantic_models
 from app.auth import verify_token
+from app.rate_limit import RateLimit
+from app import guestbook_guard
+from app.pagination import paginate
+from app.timestamps import utcnow
 
 router = APIRouter()
 
-# Public: Get Approved Entries
+Entry = schemas.GuestbookEntry
+# Keyset on ix_guestbook_approved_created: newest first, id breaks ties
+SORT_COLUMNS = (Entry.created_at, Entry.id)
+# Moderation queue: pending (0) before approved (1), then newest first
+ADMIN_SORT_COLUMNS = (Entry.approved.asc(), Entry.created_at, Entry.id)
+
+def sort_key(entry):
+    return entry.created_at, entry.id
+
+def admin_sort_key(entry):
+    return entry.approved, entry.created_at, entry.id
+
+# Public: Get Approved Entries. Pass the X-Next-Cursor header back as ?cursor= for the next page
 @router.get("/", response_model=List[pydantic_models.GuestbookEntry])
-def read_approved_entries(limit: int = 50, db: Session = Depends(get_db)):
-    entries = db.query(schemas.GuestbookEntry)\
-        .filter(schemas.GuestbookEntry.approved == 1)\
-        .order_by(schemas.GuestbookEntry.created_at.desc())\
-        .limit(limit)\
-        .all()
-    return entries
+def read_approved_entries(
+    response: Response,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    query = db.query(Entry).filter(Entry.approved == 1)
+    return paginate(query, SORT_COLUMNS, cursor, limit, response, sort_key)
 
 # Public: Submit Entry
-@router.post("/", response_model=pydantic_models.GuestbookEntry, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=pydantic_models.GuestbookEntry, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(RateLimit("guestbook", max_requests=5, period=600))])
 def create_entry(entry: pydantic_models.GuestbookEntryCreate, db: Session = Depends(get_db)):
+    # Spam, duplicates and site-wide floods are turned away before the write
+    guestbook_guard.admit(entry.name, entry.message)
     db_entry = schemas.GuestbookEntry(
         **entry.model_dump(),
         approved=0, # Pending approval
-        created_at=datetime.utcnow().isoformat()
+        # Naive UTC, like the values the migration wrote (the column has no time zone)
+        created_at=utcnow()
     )
     db.add(db_entry)
     db.commit()
     db.refresh(db_entry)
     return db_entry
 
-# Admin: Get All (Pending First)
+# Admin: Get All (Pending First), 100 per page by default; ?status= narrows to one queue
 @router.get("/all", response_model=List[pydantic_models.GuestbookEntry])
-def read_all_entries(db: Session = Depends(get_db), user=Depends(verify_token)):
-    entries = db.query(schemas.GuestbookEntry)\
-        .order_by(schemas.GuestbookEntry.approved.asc(), schemas.GuestbookEntry.created_at.desc())\
-        .all()
-    # Ordered by approved asc (0 first -> pending)
-    return entries
+def read_all_entries(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_filter: Optional[Literal["pending", "approved"]] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    user=Depends(verify_token)
+):
+    query = db.query(Entry)
+    if status_filter:
+        query = query.filter(Entry.approved == (1 if status_filter == "approved" else 0))
+    return paginate(query, ADMIN_SORT_COLUMNS, cursor, limit, response, admin_sort_key)
+
+# Admin: Approve many entries in one statement
+@router.post("/bulk/approve")
+def approve_entries(action: pydantic_models.GuestbookBulkAction, db: Session = Depends(get_db),
+                    user=Depends(verify_token)):
+    updated = db.query(Entry)\
+        .filter(Entry.id.in_(action.ids), Entry.approved == 0)\
+        .update({"approved": 1}, synchronize_session=False)
+    db.commit()
+    return {"approved": updated}
+
+# Admin: Delete many entries in one statement
+@router.post("/bulk/delete")
+def delete_entries(action: pydantic_models.GuestbookBulkAction, db: Session = Depends(get_db),
+                   user=Depends(verify_token)):
+    deleted = db.query(Entry)\
+        .filter(Entry.id.in_(action.ids))\
+        .delete(synchronize_session=False)
+    db.commit()
+    return {"deleted": deleted}
 
 # Admin: Approve
 @router.put("/{entry_id}/approve", response_model=pydantic_models.GuestbookEntry)
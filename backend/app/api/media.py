@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import cloudinary.api
-import cloudinary.uploader
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
 
 from app.database import get_db
 from app.models import schemas
 from app.auth import verify_token
+from app import media_refs, media_inventory, media_deletions
 # Ensure cloudinary is configured (imported from utils)
 import app.utils 
 
@@ -25,123 +26,114 @@ class MediaResource(BaseModel):
     status: str # "active" | "orphaned"
     usage: List[str] = []
 
+class MediaDeletionRecord(BaseModel):
+    public_id: str
+    status: str # "pending" | "processing" | "done" | "failed"
+    attempts: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
 @router.get("/audit", response_model=List[MediaResource])
-def audit_media(db: Session = Depends(get_db), user=Depends(verify_token)):
+def audit_media(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(active|orphaned)$"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+    user=Depends(verify_token)
+):
+    """
+    Audits the mirrored Cloudinary inventory against the media reference index.
+    Returns everything by default; ?limit=&offset= pages through it (total in X-Total-Count).
+    """
     try:
-        # 1. Fetch all images from Cloudinary (with pagination loop if needed, but starting simple)
-        # max_results default is 10, let's bump to 500
-        result = cloudinary.api.resources(
-            type="upload",
-            resource_type="image",
-            max_results=500
-        )
-        resources = result.get('resources', [])
-        
-        # 2. Build set of used URLs from DB
-        used_urls = set()
-        
-        # Site Config
-        config = db.query(schemas.SiteConfig).first()
-        if config:
-            if config.profile_image: used_urls.add(config.profile_image)
-            if config.about_image: used_urls.add(config.about_image)
-            
-        # Projects
-        projects = db.query(schemas.Project).filter(schemas.Project.image.isnot(None)).all()
-        for p in projects:
-            used_urls.add(p.image)
-            
-        # Blog Posts (Cover + Content Images)
-        posts = db.query(schemas.BlogPost).filter(
-            (schemas.BlogPost.cover_image.isnot(None)) | (schemas.BlogPost.content.isnot(None))
-        ).all()
-        
-        # Regex to find markdown images: ![alt](url) or <img src="url">
-        # Simplified for URLs starting with http/https
-        import re
-        url_pattern = re.compile(r'(?:!\[.*?\]\((https?://[^)]+)\))|(?:src=["\'](https?://[^"\']+)["\'])')
+        # 1. Serve from the local mirror, refreshing it off the request path when stale
+        state = media_inventory.get_state(db)
+        if refresh or not state.last_synced_at:
+            # Nothing mirrored yet (or explicitly requested): sync before answering
+            media_inventory.sync_inventory(db, full=True)
+            db.refresh(state)
+            if not state.last_synced_at:
+                # Another worker holds the first sync (or it failed): an empty list would read as "no images"
+                raise HTTPException(status_code=503, detail="Media inventory is not synced yet. Try again shortly.",
+                                    headers={"Retry-After": "10"})
+        else:
+            due = media_inventory.sync_due(state)
+            if due:
+                background_tasks.add_task(media_inventory.run_sync, due == "full")
+
+        # 2. Look up usages in the media reference index (maintained on every content write)
+        if not media_refs.is_backfilled(db):
+            # Never call images orphaned against a partial index. The backfill runs at build time
+            # (render.yaml), not here: it rewrites the whole table and must not race other workers
+            raise HTTPException(status_code=503, detail="Media reference index is not backfilled yet. "
+                                "Run scripts/backfill_media_refs.py.")
+        usage = media_refs.usage_by_public_id(db)
+
+        # 3. Join assets with usages on public_id
+        Asset = schemas.MediaAsset
+        query = db.query(Asset)
+        used = exists().where(schemas.MediaReference.public_id == Asset.public_id)
+        if status_filter == "active":
+            query = query.filter(used)
+        elif status_filter == "orphaned":
+            query = query.filter(~used)
+
+        response.headers["X-Total-Count"] = str(query.count())
+        if state.last_synced_at:
+            response.headers["X-Media-Synced-At"] = state.last_synced_at.isoformat()
+
+        query = query.order_by(Asset.created_at.desc(), Asset.public_id).offset(offset)
+        if limit:
+            query = query.limit(limit)
 
-        for p in posts:
-            if p.cover_image:
-                used_urls.add(p.cover_image)
-            
-            if p.content:
-                # Find all matches
-                matches = url_pattern.findall(p.content)
-                for match in matches:
-                    # Match returns tuple (markdown_url, html_url), filter empty
-                    img_url = next((m for m in match if m), None)
-                    if img_url:
-                        used_urls.add(img_url)
-            
-        # 3. Analyze Resources
         analyzed_resources = []
-        for res in resources:
-            public_id = res.get('public_id')
-            url = res.get('url')
-            secure_url = res.get('secure_url')
-            
-            # Check usage
-            # Cloudinary URLs might vary (http vs https, transformations). 
-            # Best way is to check if public_id exists in any of the DB URLs.
-            # But DB URLs are full URLs.
-            # Let's check strict inclusion of public_id in the DB URL string.
-            # This is safer than exact URL match because of potential transformations/versions.
-            
-            usage_list = []
-            is_active = False
-            
-            for used_url in used_urls:
-                # Simple check: is public_id in the used_url?
-                # e.g. public_id="folder/image", used_url=".../folder/image.png"
-                if public_id in used_url:
-                    is_active = True
-                    # Try to identify source for better UX
-                    if config and used_url == config.profile_image: usage_list.append("Profile Image")
-                    elif config and used_url == config.about_image: usage_list.append("About Image")
-                    else:
-                        # Check projects
-                        proj = next((p for p in projects if p.image == used_url), None)
-                        if proj: usage_list.append(f"Project: {proj.title}")
-                        
-                        # Check posts
-                        # Check cover_image OR content for the URL
-                        matched_posts = [p for p in posts if (p.cover_image == used_url) or (p.content and used_url in p.content)]
-                        for post in matched_posts:
-                            usage_list.append(f"Blog: {post.title}")
-                    
-                    # Break early if found (unless we want ALL usages, but one is enough to mark active)
-                    # Let's keep scanning to show comprehensive usage if possible, but for performance maybe break?
-                    # Let's match all for better info.
-            
-            status_val = "active" if is_active else "orphaned"
-            
+        for asset in query.all():
+            usage_list = usage.get(asset.public_id, [])
             analyzed_resources.append(MediaResource(
-                public_id=public_id,
-                url=url,
-                secure_url=secure_url,
-                format=res.get('format', ''),
-                width=res.get('width', 0),
-                height=res.get('height', 0),
-                bytes=res.get('bytes', 0),
-                created_at=res.get('created_at', ''),
-                status=status_val,
-                usage=list(set(usage_list)) # dedupe
+                public_id=asset.public_id,
+                url=asset.url or '',
+                secure_url=asset.secure_url or '',
+                format=asset.format or '',
+                width=asset.width or 0,
+                height=asset.height or 0,
+                bytes=asset.bytes or 0,
+                created_at=asset.created_at or '',
+                status="active" if usage_list else "orphaned",
+                usage=usage_list
             ))
             
         return analyzed_resources
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error auditing media: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/sync", status_code=status.HTTP_202_ACCEPTED)
+def sync_media(background_tasks: BackgroundTasks, full: bool = False, user=Depends(verify_token)):
+    """Refreshes the Cloudinary inventory mirror in the background (?full=true re-lists everything)."""
+    background_tasks.add_task(media_inventory.run_sync, full)
+    return {"message": f"Media inventory {'full' if full else 'incremental'} sync started"}
+
+@router.get("/deletions", response_model=List[MediaDeletionRecord])
+def list_deletions(limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_db), user=Depends(verify_token)):
+    """Recent entries of the Cloudinary deletion queue, with their results."""
+    return media_deletions.recent_deletions(db, limit)
+
 @router.delete("/{public_id:path}") # :path allows slashes in public_id
 def delete_media(public_id: str, db: Session = Depends(get_db), user=Depends(verify_token)):
     try:
-        result = cloudinary.uploader.destroy(public_id)
-        if result.get('result') == 'ok':
-            return {"message": "Image deleted successfully"}
-        else:
-            raise HTTPException(status_code=400, detail=f"Failed to delete: {result}")
+        # Deleted in the background by the deletion queue; hide it from the audit right away
+        media_deletions.enqueue_deletions(db, [public_id])
+        db.commit()
+        media_inventory.forget(db, [public_id])
+        return {"message": "Image queued for deletion"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -6,20 +6,30 @@ from app.models import schemas, pydantic_models
 
 from app.auth import verify_token
 from app.utils import delete_cloudinary_image
+from app import media_refs, rebuild, http_cache
+from app.content_cache import ContentCache
 
 router = APIRouter()
 
-@router.get("/", response_model=List[pydantic_models.Project])
+cache_projects = http_cache.HttpCache(schemas.Project)
+projects_content: ContentCache[List[pydantic_models.Project]] = ContentCache(schemas.Project)
+
+@router.get("/", response_model=List[pydantic_models.Project], dependencies=[Depends(cache_projects)])
 def read_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    projects = db.query(schemas.Project).offset(skip).limit(limit).all()
-    return projects
+    def load():
+        projects = db.query(schemas.Project).offset(skip).limit(limit).all()
+        return [pydantic_models.Project.model_validate(p) for p in projects]
+    return projects_content.get((skip, limit), load)
 
 @router.post("/", response_model=pydantic_models.Project, status_code=status.HTTP_201_CREATED)
 def create_project(project: pydantic_models.ProjectCreate, db: Session = Depends(get_db), user=Depends(verify_token)):
     db_project = schemas.Project(**project.model_dump())
     db.add(db_project)
+    media_refs.index_project(db, db_project)
+    http_cache.bump(db, schemas.Project)
     db.commit()
     db.refresh(db_project)
+    rebuild.request_rebuild(db, f"project: created {db_project.id}")
     return db_project
 
 @router.put("/{project_id}", response_model=pydantic_models.Project)
@@ -35,13 +45,16 @@ def update_project(project_id: str, project: pydantic_models.ProjectCreate, db:
         old_image = db_project.image
         new_image = project_data['image']
         if old_image and old_image != new_image:
-            delete_cloudinary_image(old_image)
+            delete_cloudinary_image(db, old_image)
 
     for key, value in project_data.items():
         setattr(db_project, key, value)
+    media_refs.index_project(db, db_project)
     
+    http_cache.bump(db, schemas.Project)
     db.commit()
     db.refresh(db_project)
+    rebuild.request_rebuild(db, f"project: updated {project_id}")
     return db_project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -52,8 +65,11 @@ def delete_project(project_id: str, db: Session = Depends(get_db), user=Depends(
     
     # Delete associated image from Cloudinary
     if db_project.image:
-        delete_cloudinary_image(db_project.image)
+        delete_cloudinary_image(db, db_project.image)
 
+    media_refs.remove_entity(db, "project", db_project.id)
     db.delete(db_project)
+    http_cache.bump(db, schemas.Project)
     db.commit()
+    rebuild.request_rebuild(db, f"project: deleted {project_id}")
     return None
@@ -1,42 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Dict
+from typing import Dict, List, Optional
 from app.database import get_db
 from app.models import schemas, pydantic_models
+from app.rate_limit import RateLimit
+from app.reaction_counter import reaction_counter
+from app import http_cache
+from app.content_cache import ContentCache
 
 router = APIRouter()
 
+BULK_MAX_SLUGS = 100
+
+cache_reactions = http_cache.HttpCache(schemas.BlogReaction, schemas.BlogPost)
+bulk_content: ContentCache[Dict[str, Dict[str, int]]] = ContentCache(schemas.BlogReaction, schemas.BlogPost)
+
+def with_pending(slug: str, reactions: list) -> list:
+    """Merges this worker's unflushed clicks into the stored counts."""
+    pending = reaction_counter.pending_for(slug)
+    merged = []
+    for r in reactions:
+        merged.append(pydantic_models.BlogReaction(id=r.id, slug=r.slug, reaction_type=r.reaction_type,
+                                                   count=r.count + pending.pop(r.reaction_type, 0)))
+    for reaction_type, n in pending.items():
+        merged.append(pydantic_models.BlogReaction(slug=slug, reaction_type=reaction_type, count=n))
+    return merged
+
+# Get reaction counts for many posts at once: ?slugs=a,b,c, or every published post when omitted.
+# Declared before /{slug} so "bulk" is not taken for a slug.
+@router.get("/bulk", response_model=Dict[str, Dict[str, int]], dependencies=[Depends(cache_reactions)])
+def get_reactions_bulk(slugs: Optional[str] = Query(None, description="Comma-separated post slugs"),
+                       db: Session = Depends(get_db)):
+    wanted = tuple(sorted({s.strip() for s in slugs.split(",") if s.strip()})) if slugs is not None else None
+    if wanted is not None and not wanted:
+        raise HTTPException(status_code=400, detail="No slugs given")
+    if wanted is not None and len(wanted) > BULK_MAX_SLUGS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_SLUGS} slugs per request")
+
+    def load():
+        # One grouped query for the whole page
+        query = db.query(schemas.BlogReaction.slug, schemas.BlogReaction.reaction_type,
+                         func.sum(schemas.BlogReaction.count))
+        if wanted is None:
+            published = db.query(schemas.BlogPost.slug).filter(schemas.BlogPost.published == True)
+            query = query.filter(schemas.BlogReaction.slug.in_(published))
+        else:
+            query = query.filter(schemas.BlogReaction.slug.in_(wanted))
+        # Every published post gets an entry, even before its first reaction
+        counts = {slug: {} for (slug,) in published} if wanted is None else {}
+        for slug, reaction_type, count in query.group_by(schemas.BlogReaction.slug,
+                                                          schemas.BlogReaction.reaction_type):
+            counts.setdefault(slug, {})[reaction_type] = int(count)
+        return counts
+
+    # Stored counts only: the ETag tracks the blog_reactions version, so merging this worker's
+    # unflushed clicks would change the body without changing the validator. The clicker sees
+    # their own click in the POST response; everyone sees it after the next flush.
+    return bulk_content.get(("published",) if wanted is None else ("slugs", wanted), load)
+
 # Get reactions for a specific post
 @router.get("/{slug}", response_model=List[pydantic_models.BlogReaction])
 def get_reactions(slug: str, db: Session = Depends(get_db)):
     reactions = db.query(schemas.BlogReaction).filter(schemas.BlogReaction.slug == slug).all()
-    return reactions
+    return with_pending(slug, reactions)
 
-# Increment reaction count
-@router.post("/{slug}/{reaction_type}", response_model=pydantic_models.BlogReaction)
+# Increment reaction count (buffered; written by the reaction flusher)
+@router.post("/{slug}/{reaction_type}", response_model=pydantic_models.BlogReaction,
+             dependencies=[Depends(RateLimit("reactions", max_requests=30, period=60))])
 def react_to_post(slug: str, reaction_type: str, db: Session = Depends(get_db)):
-    # Find existing reaction entry
-    reaction = db.query(schemas.BlogReaction).filter(
+    reaction_counter.increment(slug, reaction_type)
+
+    stored = db.query(schemas.BlogReaction).filter(
         schemas.BlogReaction.slug == slug,
         schemas.BlogReaction.reaction_type == reaction_type
     ).first()
-    
-    if reaction:
-        reaction.count += 1
-    else:
-        # Create new entry if doesn't exist
-        reaction = schemas.BlogReaction(
-            slug=slug,
-            reaction_type=reaction_type,
-            count=1
-        )
-        db.add(reaction)
-    
-    try:
-        db.commit()
-        db.refresh(reaction)
-        return reaction
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
+    merged = with_pending(slug, [stored] if stored else [])
+    return next(r for r in merged if r.reaction_type == reaction_type)
@@ -4,18 +4,27 @@ from typing import List
 from app.database import get_db
 from app.models import schemas, pydantic_models
 from app.auth import verify_token
+from app import rebuild, http_cache
+from app.content_cache import ContentCache
 
 router = APIRouter()
 
-@router.get("/", response_model=List[pydantic_models.Skill])
+cache_skills = http_cache.HttpCache(schemas.Skill)
+skills_content: ContentCache[List[pydantic_models.Skill]] = ContentCache(schemas.Skill)
+
+@router.get("/", response_model=List[pydantic_models.Skill], dependencies=[Depends(cache_skills)])
 def read_skills(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    skills = db.query(schemas.Skill).offset(skip).limit(limit).all()
-    return skills
+    def load():
+        skills = db.query(schemas.Skill).offset(skip).limit(limit).all()
+        return [pydantic_models.Skill.model_validate(s) for s in skills]
+    return skills_content.get((skip, limit), load)
 
 @router.post("/", response_model=pydantic_models.Skill, status_code=status.HTTP_201_CREATED)
 def create_skill(skill: pydantic_models.SkillCreate, db: Session = Depends(get_db), user=Depends(verify_token)):
     db_skill = schemas.Skill(**skill.model_dump())
     db.add(db_skill)
+    http_cache.bump(db, schemas.Skill)
     db.commit()
     db.refresh(db_skill)
+    rebuild.request_rebuild(db, f"skill: created {db_skill.name}")
     return db_skill
@@ -0,0 +1,83 @@
+import os
+import threading
+import google.generativeai as genai
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GENERATION_MODEL = "gemini-flash-latest"
+
+# Per-worker registry of remote clients. Building these per request repeats the TLS
+# handshake and object setup; here they are created once and reused until the key changes.
+_lock = threading.Lock()
+_gemini_key = None
+_models = {}
+_pinecone_key = None
+_pinecone_indexes = {}
+
+
+def configure_gemini() -> bool:
+    """Configures the Gemini SDK once per API key. Returns False if no key is set."""
+    global _gemini_key
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return False
+    if api_key != _gemini_key:
+        with _lock:
+            if api_key != _gemini_key:
+                genai.configure(api_key=api_key)
+                _models.clear()  # Models hold a client bound to the old key
+                _gemini_key = api_key
+                print("🔑 Gemini client configured")
+    return True
+
+
+def get_gemini_model(name: str = GENERATION_MODEL):
+    """Returns a warm GenerativeModel handle, or None if Gemini is not configured."""
+    if not configure_gemini():
+        return None
+    model = _models.get(name)
+    if model is None:
+        with _lock:
+            model = _models.get(name)
+            if model is None:
+                model = genai.GenerativeModel(name)
+                _models[name] = model
+    return model
+
+
+def get_pinecone_index(index_name: str):
+    """Returns a cached Pinecone index handle (keeps its connection pool), or None without a key."""
+    global _pinecone_key
+    api_key = os.getenv("PINECONE_API_KEY")
+    if not api_key:
+        return None
+    if api_key != _pinecone_key:
+        with _lock:
+            if api_key != _pinecone_key:
+                _pinecone_indexes.clear()
+                _pinecone_key = api_key
+    index = _pinecone_indexes.get(index_name)
+    if index is None:
+        with _lock:
+            index = _pinecone_indexes.get(index_name)
+            if index is None:
+                from pinecone import Pinecone
+                index = Pinecone(api_key=api_key).Index(index_name)
+                _pinecone_indexes[index_name] = index
+                print(f"🌲 Pinecone index handle created: {index_name}")
+    return index
+
+
+def reload_clients():
+    """
+    Re-reads .env and drops every cached client so the next call rebuilds them.
+    Key changes made through the environment are also picked up automatically.
+    """
+    global _gemini_key, _pinecone_key
+    load_dotenv(override=True)
+    with _lock:
+        _models.clear()
+        _pinecone_indexes.clear()
+        _gemini_key = None
+        _pinecone_key = None
@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+from app.http_cache import get_versions
+
+T = TypeVar("T")
+
+
+class ContentCache(Generic[T]):
+    """
+    Per-worker read-through cache of serialized (Pydantic) responses for small, rarely
+    changing tables. An entry is valid while the versions of its tables are unchanged;
+    admin writes bump those versions in the DB (http_cache.bump), which every worker
+    sees within HTTP_CACHE_VERSION_TTL_SECONDS, so hits never touch the connection pool.
+    """
+
+    def __init__(self, *models, max_entries: int = 32):
+        self.tables = [model.__tablename__ for model in models]
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[tuple, T]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, loader: Callable[[], T]) -> T:
+        try:
+            versions = get_versions()
+            stamp = tuple(versions.get(table, 0) for table in self.tables)
+        except Exception as e:
+            print(f"⚠️ Content cache bypassed: {e}")
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Load outside the lock; versions were read first, so a write racing with the load
+        # at worst stores fresh data under the older stamp and is reloaded next time
+        value = loader()
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
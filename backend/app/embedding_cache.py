@@ -0,0 +1,112 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from app.vector_store import KB_DATA_DIR
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+# SQLite spill file shared by all workers on the host. Set to an empty string to disable.
+EMBEDDING_CACHE_DB = os.getenv("EMBEDDING_CACHE_DB", os.path.join(KB_DATA_DIR, "embedding_cache.sqlite3"))
+EMBEDDING_CACHE_DB_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_DB_MAX_ROWS", "20000"))
+
+
+def normalize_text(text: str) -> str:
+    """Case and whitespace differences should not cost another embedding call."""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class EmbeddingCache:
+    """Bounded in-memory LRU of query embeddings, backed by an optional SQLite file."""
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE, db_path: str | None = EMBEDDING_CACHE_DB):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Embedding cache spill file disabled: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(text: str, model: str, task_type: str) -> str:
+        raw = f"{model}|{task_type}|{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> list[float] | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        vector = np.frombuffer(row[0], dtype=np.float32).tolist()
+                        self._db.execute("UPDATE embeddings SET last_used = ? WHERE key = ?", (time.time(), key))
+                        self._db.commit()
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+                        return vector
+                except sqlite3.Error as e:
+                    print(f"⚠️ Embedding cache read error: {e}")
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: list[float]):
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                        (key, np.asarray(vector, dtype=np.float32).tobytes(), time.time())
+                    )
+                    # Keep the spill file bounded: drop the least recently used rows
+                    self._db.execute(
+                        "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings "
+                        "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (EMBEDDING_CACHE_DB_MAX_ROWS,)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Embedding cache write error: {e}")
+
+    def _remember(self, key: str, vector: list[float]):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,107 @@
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import Counter, deque
+from fastapi import HTTPException
+from app.rate_limit import get_store
+
+# Admission checks for anonymous guestbook submissions, run before anything touches the DB.
+# The per-IP RateLimit on the route stops a single client; this adds a site-wide ceiling
+# for distributed floods, duplicate suppression and a cheap spam score.
+
+# Site-wide submissions per hour across all clients (shared through the rate limit store).
+# Past it the guestbook is treated as flooded: entries are still accepted into the moderation
+# queue, but the stricter GUESTBOOK_FLOOD_SPAM_THRESHOLD applies, so a few IPs can't lock everyone out
+GUESTBOOK_GLOBAL_MAX_PER_HOUR = int(os.getenv("GUESTBOOK_GLOBAL_MAX_PER_HOUR", "300"))
+# Fingerprints of the most recent messages remembered for duplicate suppression (per worker)
+GUESTBOOK_RECENT_HASHES = int(os.getenv("GUESTBOOK_RECENT_HASHES", "512"))
+# Messages scoring at or above this are rejected
+GUESTBOOK_SPAM_THRESHOLD = int(os.getenv("GUESTBOOK_SPAM_THRESHOLD", "3"))
+# ... and this while the site-wide ceiling is exceeded (1: any link or shouting is rejected)
+GUESTBOOK_FLOOD_SPAM_THRESHOLD = int(os.getenv("GUESTBOOK_FLOOD_SPAM_THRESHOLD", "1"))
+
+LINK_PATTERN = re.compile(r"https?://|www\.|\[url|<a\s", re.IGNORECASE)
+REPEATED_CHARS = re.compile(r"(.)\1{7,}")
+NON_WORD = re.compile(r"[\W_]+")
+
+
+def fingerprint(message: str) -> str:
+    """Hash of the message with case, punctuation and whitespace removed."""
+    normalized = NON_WORD.sub("", message.lower())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def spam_score(name: str, message: str) -> int:
+    """Cheap heuristics: links, long character runs, shouting, links in the name."""
+    score = 2 * len(LINK_PATTERN.findall(message))
+    if LINK_PATTERN.search(name):
+        score += 3
+    if REPEATED_CHARS.search(message):
+        score += 1
+    letters = [c for c in message if c.isalpha()]
+    if len(letters) >= 20 and sum(c.isupper() for c in letters) / len(letters) > 0.7:
+        score += 1
+    return score
+
+
+class RecentMessages:
+    """Bounded ring buffer of message fingerprints with O(1) membership checks."""
+
+    def __init__(self, size: int = GUESTBOOK_RECENT_HASHES):
+        self._ring = deque(maxlen=size)
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._counts
+
+    def add_if_new(self, digest: str) -> bool:
+        """Remembers `digest`; returns False if it is already among the recent messages."""
+        with self._lock:
+            if self._counts[digest]:
+                return False
+            if len(self._ring) == self._ring.maxlen:
+                evicted = self._ring[0]
+                self._counts[evicted] -= 1
+                if not self._counts[evicted]:
+                    del self._counts[evicted]
+            self._ring.append(digest)
+            self._counts[digest] += 1
+            return True
+
+
+recent_messages = RecentMessages()
+
+
+def flooded() -> bool:
+    """Takes a token from the site-wide bucket; True once the hourly ceiling is exceeded."""
+    try:
+        allowed, _ = get_store().take(
+            "guestbook:all", float(GUESTBOOK_GLOBAL_MAX_PER_HOUR), GUESTBOOK_GLOBAL_MAX_PER_HOUR / 3600, time.time()
+        )
+    except Exception as e:
+        # Never fail a submission because the limiter's store is unavailable
+        print(f"⚠️ Guestbook flood guard error: {e}")
+        return False
+    return not allowed
+
+
+def admit(name: str, message: str):
+    """Raises HTTPException unless the submission may be written (always as pending)."""
+    digest = fingerprint(message)
+    if digest in recent_messages:
+        raise HTTPException(status_code=409, detail="This message was already submitted.")
+
+    threshold = GUESTBOOK_SPAM_THRESHOLD
+    if flooded():
+        print("⚠️ Guestbook flood ceiling exceeded, applying the strict spam threshold")
+        threshold = min(threshold, GUESTBOOK_FLOOD_SPAM_THRESHOLD)
+    if spam_score(name, message) >= threshold:
+        raise HTTPException(status_code=400, detail="Message looks like spam.")
+
+    # Recorded only once admitted, so a message rejected as spam can be reworded and resent
+    if not recent_messages.add_if_new(digest):
+        raise HTTPException(status_code=409, detail="This message was already submitted.")
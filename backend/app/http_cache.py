@@ -0,0 +1,136 @@
+import os
+import time
+import hashlib
+import threading
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import schemas
+
+# HTTP validators for public reads. Every content table has a version counter that write
+# handlers bump in their own transaction; the ETag of a response is derived from the
+# versions of the tables it reads, so If-None-Match is answered with 304 from the
+# in-process copy of the counters, before the endpoint (or any DB query) runs.
+HTTP_CACHE_VERSION_TTL_SECONDS = float(os.getenv("HTTP_CACHE_VERSION_TTL_SECONDS", "2"))
+# Browsers revalidate every time (cheap 304s) but may show a stale copy while doing so
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "60"))
+# A new deploy can change response shapes, so it must not match old ETags
+APP_REVISION = os.getenv("RENDER_GIT_COMMIT") or os.getenv("VERCEL_GIT_COMMIT_SHA") or ""
+
+# Version of the denormalized blog_posts.reaction_total / reaction_counts, bumped by the reaction
+# flusher instead of blog_posts, so a click doesn't invalidate every cached post and listing
+REACTION_TOTALS = "reaction_totals"
+
+CACHED_TABLES = (schemas.SiteConfig, schemas.SocialLink, schemas.ResumeFile, schemas.Project,
+                 schemas.Skill, schemas.Experience, schemas.BlogPost, schemas.BlogReaction, REACTION_TOTALS)
+
+Version = schemas.TableVersion
+
+_versions = {}
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _table(model) -> str:
+    return model if isinstance(model, str) else model.__tablename__
+
+
+def ensure_versions():
+    """Creates the counter rows (startup), so bump() is a plain UPDATE."""
+    db = SessionLocal()
+    try:
+        existing = {name for (name,) in db.query(Version.name).all()}
+        for model in CACHED_TABLES:
+            if _table(model) not in existing:
+                db.add(Version(name=_table(model), version=0))
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # Another worker seeded them first
+    finally:
+        db.close()
+
+
+def get_versions() -> dict:
+    """Table versions, re-read from the DB at most every HTTP_CACHE_VERSION_TTL_SECONDS per worker."""
+    global _versions, _loaded_at
+    if time.monotonic() - _loaded_at < HTTP_CACHE_VERSION_TTL_SECONDS:
+        return _versions
+    with _lock:
+        if time.monotonic() - _loaded_at >= HTTP_CACHE_VERSION_TTL_SECONDS:
+            db = SessionLocal()
+            try:
+                _versions = {name: version for name, version in db.query(Version.name, Version.version).all()}
+                _loaded_at = time.monotonic()
+            finally:
+                db.close()
+    return _versions
+
+
+def invalidate():
+    """Forces this worker to re-read the versions on the next request."""
+    global _loaded_at
+    _loaded_at = 0.0
+
+
+def bump(db: Session, *models):
+    """
+    Increments the version of each table written by the current transaction.
+    Call before db.commit(); this worker drops its cached versions once the commit lands.
+    """
+    names = [_table(model) for model in models]
+    updated = db.query(Version).filter(Version.name.in_(names))\
+        .update({"version": Version.version + 1}, synchronize_session=False)
+    if updated < len(names):
+        existing = {name for (name,) in db.query(Version.name).filter(Version.name.in_(names)).all()}
+        for name in names:
+            if name not in existing:
+                db.add(Version(name=name, version=1))
+    event.listen(db, "after_commit", lambda session: invalidate(), once=True)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+class HttpCache:
+    """
+    Dependency that sets ETag and Cache-Control on a public GET and short-circuits with
+    304 Not Modified when the client's If-None-Match is current.
+    Usage: @router.get(..., dependencies=[Depends(HttpCache(schemas.Project))])
+    """
+
+    def __init__(self, *models, max_age: int = HTTP_CACHE_MAX_AGE,
+                 stale_while_revalidate: int = HTTP_CACHE_STALE_WHILE_REVALIDATE):
+        self.tables = [_table(model) for model in models]
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def etag(self, request: Request) -> str:
+        versions = get_versions()
+        key = "|".join([APP_REVISION, request.url.path, str(request.query_params)] +
+                       [f"{table}:{versions.get(table, 0)}" for table in self.tables])
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+    def __call__(self, request: Request, response: Response):
+        if "authorization" in request.headers:
+            # Admin reads must never be served stale. The per-worker version copy can lag
+            # another worker's write by HTTP_CACHE_VERSION_TTL_SECONDS, so don't validate at all
+            response.headers["Cache-Control"] = "private, no-store"
+            return
+        try:
+            etag = self.etag(request)
+        except Exception as e:
+            print(f"⚠️ HTTP cache unavailable, serving uncached: {e}")
+            return
+        cache_control = f"public, max-age={self.max_age}, stale-while-revalidate={self.stale_while_revalidate}"
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
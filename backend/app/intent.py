@@ -0,0 +1,45 @@
+import numpy as np
+from app.vector_store import get_local_retriever
+
+# Chunk metadata type -> chat intent. GitHub READMEs and file trees describe projects.
+INTENT_LABELS = {
+    "project": "project",
+    "readme": "project",
+    "structure": "project",
+    "blog": "blog",
+    "skills": "skills",
+    "resume": "resume",
+}
+
+# Cosine similarity to the nearest centroid below which the question is treated as general
+GENERAL_MAX_SCORE = 0.25
+# Best centroid must clear this score and beat the runner-up by MARGIN to be trusted
+CONFIDENT_MIN_SCORE = 0.40
+CONFIDENT_MARGIN = 0.04
+
+
+def classify_intent(query_vector) -> tuple[str | None, bool]:
+    """
+    Picks the intent whose centroid (mean embedding of that type's knowledge base chunks)
+    is closest to the query embedding. No model call is made.
+    Returns (intent, confident); intent is None for general questions.
+    """
+    try:
+        labels, centroids = get_local_retriever().index.centroids(INTENT_LABELS)
+        if len(labels) < 2:
+            return None, False
+
+        q = np.asarray(query_vector, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        scores = centroids @ q
+        order = np.argsort(-scores)
+        best, runner_up = float(scores[order[0]]), float(scores[order[1]])
+
+        if best < GENERAL_MAX_SCORE:
+            return None, True
+        if best >= CONFIDENT_MIN_SCORE and best - runner_up >= CONFIDENT_MARGIN:
+            return labels[order[0]], True
+        return labels[order[0]], False
+    except Exception as e:
+        print(f"⚠️ Local intent classification error: {e}")
+        return None, False
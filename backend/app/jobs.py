@@ -0,0 +1,146 @@
+import os
+import sys
+import socket
+import subprocess
+import threading
+from datetime import timedelta
+from sqlalchemy import exists, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from app.models import schemas
+from app.timestamps import utcnow
+
+# "spawn": the web process starts a short-lived worker process per job (default)
+# "external": a long-running `python scripts/ingest_worker.py` service picks jobs up
+INGEST_WORKER_MODE = os.getenv("INGEST_WORKER_MODE", "spawn").lower()
+# A running job whose worker has not reported progress for this long is considered dead
+INGEST_JOB_STALE_SECONDS = int(os.getenv("INGEST_JOB_STALE_SECONDS", "900"))
+# A queued job that no worker has claimed for this long is abandoned (worker down or failed to spawn)
+INGEST_JOB_QUEUE_TIMEOUT_SECONDS = int(os.getenv("INGEST_JOB_QUEUE_TIMEOUT_SECONDS", "900"))
+# Workers refresh the heartbeat this often while a job runs, whether or not it makes progress
+INGEST_HEARTBEAT_SECONDS = int(os.getenv("INGEST_HEARTBEAT_SECONDS", "30"))
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "../scripts/ingest_worker.py")
+
+Job = schemas.IngestionJob
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobConflict(Exception):
+    """Raised when an ingestion job is already queued or running."""
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def fail_stale_jobs(db: Session):
+    """
+    Running jobs without a recent heartbeat belong to a crashed worker; queued jobs nobody
+    claimed in time were never picked up. Either would otherwise block new jobs forever.
+    """
+    now = utcnow()
+    db.query(Job)\
+        .filter(Job.status == "running", Job.heartbeat_at < now - timedelta(seconds=INGEST_JOB_STALE_SECONDS))\
+        .update({"status": "failed", "error": "Worker stopped responding", "finished_at": now},
+                synchronize_session=False)
+    db.query(Job)\
+        .filter(Job.status == "queued", Job.created_at < now - timedelta(seconds=INGEST_JOB_QUEUE_TIMEOUT_SECONDS))\
+        .update({"status": "failed", "error": "No worker picked up the job", "finished_at": now},
+                synchronize_session=False)
+    db.commit()
+
+
+def enqueue_ingestion(db: Session, full: bool = False) -> Job:
+    """
+    Queues an ingestion job. Single-flight: raises JobConflict if one is already active.
+    The check is only a fast path; ix_ingestion_jobs_single_active rejects the insert
+    when two requests race past it.
+    """
+    fail_stale_jobs(db)
+    if db.query(exists().where(Job.status.in_(ACTIVE_STATUSES))).scalar():
+        raise JobConflict("Ingestion already in progress")
+
+    job = Job(status="queued", full=full, created_at=utcnow())
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise JobConflict("Ingestion already in progress")
+    db.refresh(job)
+
+    if INGEST_WORKER_MODE == "spawn":
+        spawn_worker()
+    return job
+
+
+def spawn_worker():
+    """
+    Starts a detached worker process that runs the next queued job and exits.
+    It inherits the web process's cwd and environment, so it sees the same database.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(WORKER_SCRIPT), "--once"],
+        start_new_session=True
+    )
+    # Reap the child when it exits, so long-lived web workers don't collect zombies
+    threading.Thread(target=proc.wait, name="ingest-worker-reaper", daemon=True).start()
+
+
+def claim_next_job(db: Session, worker: str) -> Job | None:
+    """
+    Atomically moves the oldest queued job to running, but only while no other job is
+    running, so at most one ingestion runs across all processes and hosts.
+    """
+    fail_stale_jobs(db)
+    job = db.query(Job).filter(Job.status == "queued").order_by(Job.id).first()
+    if not job:
+        return None
+
+    running = aliased(Job)
+    now = utcnow()
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "queued")
+        .where(~exists().where(running.status == "running"))
+        .values(status="running", worker=worker, started_at=now, heartbeat_at=now)
+    )
+    db.commit()
+    if result.rowcount != 1:
+        return None
+    db.refresh(job)
+    return job
+
+
+def report_progress(db: Session, job_id: int, stats: dict):
+    """Stores per-stage counters (fetched, embedded, upserted, removed) and refreshes the heartbeat."""
+    db.query(Job).filter(Job.id == job_id).update({
+        "chunks_fetched": stats.get("fetched", 0),
+        "chunks_embedded": stats.get("embedded", 0),
+        "chunks_upserted": stats.get("upserted", 0),
+        "chunks_removed": stats.get("removed", 0),
+        "heartbeat_at": utcnow(),
+    }, synchronize_session=False)
+    db.commit()
+
+
+def heartbeat(db: Session, job_id: int):
+    """Marks a running job as alive (see fail_stale_jobs)."""
+    db.query(Job).filter(Job.id == job_id, Job.status == "running")\
+        .update({"heartbeat_at": utcnow()}, synchronize_session=False)
+    db.commit()
+
+
+def finish_job(db: Session, job_id: int, error: str | None = None):
+    db.query(Job).filter(Job.id == job_id).update({
+        "status": "failed" if error else "completed",
+        "error": error,
+        "finished_at": utcnow(),
+    }, synchronize_session=False)
+    db.commit()
+
+
+def latest_job(db: Session) -> Job | None:
+    fail_stale_jobs(db)
+    return db.query(Job).order_by(Job.id.desc()).first()
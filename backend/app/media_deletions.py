@@ -0,0 +1,136 @@
+import os
+import socket
+import threading
+from datetime import timedelta
+import cloudinary.api
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import schemas
+from app.timestamps import utcnow
+
+# Durable queue of Cloudinary deletions. Request handlers only insert rows (in the same
+# transaction as the content change); a drainer thread in each web worker deletes them in
+# bulk with cloudinary.api.delete_resources, so content edits never wait on Cloudinary.
+MEDIA_DELETE_BATCH_SIZE = 100  # delete_resources accepts at most 100 public_ids per call
+MEDIA_DELETE_MAX_ATTEMPTS = int(os.getenv("MEDIA_DELETE_MAX_ATTEMPTS", "6"))
+MEDIA_DELETE_POLL_SECONDS = int(os.getenv("MEDIA_DELETE_POLL_SECONDS", "60"))
+# A batch claimed longer ago than this belongs to a dead drainer and is retried
+MEDIA_DELETE_CLAIM_TIMEOUT_SECONDS = 300
+
+Deletion = schemas.MediaDeletion
+
+_wakeup = threading.Event()
+_drainer = None
+_drainer_lock = threading.Lock()
+
+
+def enqueue_deletions(db: Session, public_ids):
+    """
+    Queues public_ids for deletion. Nothing is committed here: the rows become visible
+    (and the drainer is woken up) when the caller commits its transaction.
+    """
+    now = utcnow()
+    queued = False
+    for public_id in dict.fromkeys(p for p in public_ids if p):
+        # No autoflush: the caller's pending changes must only hit the DB at its own commit
+        with db.no_autoflush:
+            already = db.query(Deletion.id)\
+                .filter(Deletion.public_id == public_id, Deletion.status.in_(("pending", "processing")))\
+                .first()
+        if already:
+            continue
+        db.add(Deletion(public_id=public_id, status="pending", attempts=0,
+                        created_at=now, next_attempt_at=now))
+        queued = True
+    if queued:
+        event.listen(db, "after_commit", lambda session: _wakeup.set(), once=True)
+
+
+def _claim_batch(db: Session, drainer: str) -> list:
+    now = utcnow()
+    stale = now - timedelta(seconds=MEDIA_DELETE_CLAIM_TIMEOUT_SECONDS)
+    due = or_(
+        (Deletion.status == "pending") & (Deletion.next_attempt_at <= now),
+        (Deletion.status == "processing") & (Deletion.claimed_at < stale),
+    )
+    ids = [row.id for row in db.query(Deletion.id).filter(due)
+           .order_by(Deletion.id).limit(MEDIA_DELETE_BATCH_SIZE).all()]
+    if not ids:
+        return []
+    token = f"{drainer}:{now.timestamp()}"
+    # Conditional update: rows another drainer claimed in the meantime no longer match `due`
+    db.query(Deletion).filter(Deletion.id.in_(ids), due)\
+        .update({"status": "processing", "claimed_by": token, "claimed_at": now}, synchronize_session=False)
+    db.commit()
+    return db.query(Deletion).filter(Deletion.claimed_by == token).all()
+
+
+def _delete_batch(db: Session, rows: list):
+    try:
+        response = cloudinary.api.delete_resources([row.public_id for row in rows])
+        results = response.get("deleted", {})
+        error = None
+    except Exception as e:
+        results, error = {}, str(e)
+
+    now = utcnow()
+    for row in rows:
+        row.attempts = (row.attempts or 0) + 1
+        result = results.get(row.public_id)
+        if result in ("deleted", "not_found"):
+            row.status, row.result, row.error, row.finished_at = "done", result, None, now
+        elif row.attempts >= MEDIA_DELETE_MAX_ATTEMPTS:
+            row.status, row.result, row.error, row.finished_at = "failed", result, error, now
+        else:
+            # Exponential backoff: 30s, 1m, 2m, 4m, ...
+            row.status, row.result, row.error = "pending", result, error
+            row.next_attempt_at = now + timedelta(seconds=30 * 2 ** (row.attempts - 1))
+        row.claimed_by = None
+    db.commit()
+
+    done = sum(1 for row in rows if row.status == "done")
+    if error:
+        print(f"⚠️ Cloudinary bulk delete failed for {len(rows)} images: {error}")
+    else:
+        print(f"🗑️ Cloudinary bulk delete: {done}/{len(rows)} images removed")
+
+
+def drain(drainer: str = None) -> int:
+    """Processes every due deletion in batches. Returns the number of rows handled."""
+    drainer = drainer or f"{socket.gethostname()}:{os.getpid()}"
+    handled = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = _claim_batch(db, drainer)
+            if not rows:
+                return handled
+            _delete_batch(db, rows)
+            handled += len(rows)
+    finally:
+        db.close()
+
+
+def _run():
+    while True:
+        _wakeup.wait(MEDIA_DELETE_POLL_SECONDS)
+        _wakeup.clear()
+        try:
+            drain()
+        except Exception as e:
+            print(f"❌ Media deletion drainer error: {e}")
+
+
+def start_drainer():
+    """Starts this worker's background drainer thread (idempotent)."""
+    global _drainer
+    with _drainer_lock:
+        if _drainer is None or not _drainer.is_alive():
+            _drainer = threading.Thread(target=_run, name="media-deletion-drainer", daemon=True)
+            _drainer.start()
+            _wakeup.set()  # Pick up anything left over from before a restart
+
+
+def recent_deletions(db: Session, limit: int = 50) -> list:
+    return db.query(Deletion).order_by(Deletion.id.desc()).limit(limit).all()
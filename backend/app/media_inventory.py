@@ -0,0 +1,147 @@
+import os
+from datetime import datetime, timedelta
+import cloudinary.api
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import schemas
+from app.timestamps import utcnow
+# Ensure cloudinary is configured (imported from utils)
+import app.utils
+
+# Local mirror of the Cloudinary image library, so the media audit does not depend on a
+# live listing. Incremental syncs only page through images uploaded since the newest
+# mirrored one; a periodic full sync also drops images deleted outside the admin.
+MEDIA_SYNC_INTERVAL_SECONDS = int(os.getenv("MEDIA_SYNC_INTERVAL_SECONDS", "300"))
+MEDIA_FULL_SYNC_INTERVAL_SECONDS = int(os.getenv("MEDIA_FULL_SYNC_INTERVAL_SECONDS", "86400"))
+# A sync that has been "syncing" this long belongs to a dead worker
+MEDIA_SYNC_STALE_SECONDS = 600
+PAGE_SIZE = 500  # Cloudinary Admin API maximum
+
+Asset = schemas.MediaAsset
+State = schemas.MediaSyncState
+
+
+def get_state(db: Session) -> State:
+    state = db.query(State).filter(State.id == 1).first()
+    if not state:
+        state = State(id=1, status="idle")
+        db.add(state)
+        db.commit()
+    return state
+
+
+def sync_due(state: State) -> str | None:
+    """Returns "full" or "incremental" if the mirror should be refreshed, else None."""
+    now = utcnow()
+    if not state.last_full_sync_at or now - state.last_full_sync_at > timedelta(seconds=MEDIA_FULL_SYNC_INTERVAL_SECONDS):
+        return "full"
+    if not state.last_synced_at or now - state.last_synced_at > timedelta(seconds=MEDIA_SYNC_INTERVAL_SECONDS):
+        return "incremental"
+    return None
+
+
+def _claim(db: Session) -> bool:
+    """Marks the sync as running unless another worker already is (single-flight across workers)."""
+    get_state(db)
+    now = utcnow()
+    stale = now - timedelta(seconds=MEDIA_SYNC_STALE_SECONDS)
+    claimed = db.query(State)\
+        .filter(State.id == 1, or_(State.status != "syncing", State.started_at < stale))\
+        .update({"status": "syncing", "started_at": now, "error": None}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def iter_resources(start_at: str | None = None):
+    """Pages through the Cloudinary image listing by next_cursor, yielding one page at a time."""
+    params = {"type": "upload", "resource_type": "image", "max_results": PAGE_SIZE}
+    if start_at:
+        # Oldest first from the high-water mark, so an interrupted sync can resume from it
+        params.update(start_at=start_at, direction="asc")
+    cursor = None
+    while True:
+        result = cloudinary.api.resources(next_cursor=cursor, **params) if cursor \
+            else cloudinary.api.resources(**params)
+        yield result.get("resources", [])
+        cursor = result.get("next_cursor")
+        if not cursor:
+            return
+
+
+def _upsert_page(db: Session, resources: list, now: datetime):
+    existing = {a.public_id: a for a in db.query(Asset).filter(
+        Asset.public_id.in_([r["public_id"] for r in resources])).all()}
+    for res in resources:
+        asset = existing.get(res["public_id"]) or Asset(public_id=res["public_id"])
+        asset.url = res.get("url")
+        asset.secure_url = res.get("secure_url")
+        asset.format = res.get("format", "")
+        asset.width = res.get("width", 0)
+        asset.height = res.get("height", 0)
+        asset.bytes = res.get("bytes", 0)
+        asset.created_at = res.get("created_at", "")
+        asset.synced_at = now
+        if res["public_id"] not in existing:
+            db.add(asset)
+
+
+def sync_inventory(db: Session, full: bool = False) -> int | None:
+    """
+    Refreshes the mirror from Cloudinary. Returns the number of resources fetched, or
+    None if another worker is already syncing.
+    """
+    if not _claim(db):
+        return None
+    state = get_state(db)
+    full = full or not state.newest_created_at
+    started = utcnow()
+    fetched = 0
+    newest = state.newest_created_at or ""
+    try:
+        for page in iter_resources(None if full else state.newest_created_at):
+            _upsert_page(db, page, started)
+            fetched += len(page)
+            newest = max([newest] + [r.get("created_at", "") for r in page])
+            if not full:
+                # Advance the high-water mark per page, so a failed sync resumes where it stopped
+                state.newest_created_at = newest or None
+            db.commit()
+
+        if full:
+            # Anything not seen in a full listing was deleted outside the admin
+            removed = db.query(Asset).filter(or_(Asset.synced_at < started, Asset.synced_at.is_(None)))\
+                .delete(synchronize_session=False)
+            if removed:
+                print(f"🧹 Removed {removed} images deleted outside the admin from the media mirror")
+            state.last_full_sync_at = utcnow()
+        state.newest_created_at = newest or None
+        state.last_synced_at = utcnow()
+        state.status = "idle"
+        db.commit()
+        print(f"✅ Media inventory {'full' if full else 'incremental'} sync: {fetched} resources")
+        return fetched
+    except Exception as e:
+        db.rollback()
+        db.query(State).filter(State.id == 1).update({"status": "failed", "error": str(e)},
+                                                      synchronize_session=False)
+        db.commit()
+        print(f"❌ Media inventory sync failed: {e}")
+        raise
+
+
+def forget(db: Session, public_ids: list):
+    """Drops deleted images from the mirror right away instead of waiting for a full sync."""
+    db.query(Asset).filter(Asset.public_id.in_(public_ids)).delete(synchronize_session=False)
+    db.commit()
+
+
+def run_sync(full: bool = False):
+    """Background-task entry point with its own session (the request's session is closed by then)."""
+    db = SessionLocal()
+    try:
+        sync_inventory(db, full=full)
+    except Exception:
+        pass  # Already recorded on the sync state
+    finally:
+        db.close()
@@ -0,0 +1,100 @@
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from app.models import schemas
+from app.timestamps import utcnow
+from app.utils import extract_public_id, find_content_images
+
+# Reverse index of Cloudinary images: public_id -> entities that display it.
+# Rows for an entity are replaced in the same transaction as the entity write, so the
+# media audit is a lookup instead of a scan over every project and post body.
+
+Ref = schemas.MediaReference
+State = schemas.MediaSyncState
+
+
+def _replace(db: Session, entity_type: str, entity_id, label: str, urls_by_field: dict):
+    """Replaces all reference rows of one entity. urls_by_field maps field -> list of URLs."""
+    entity_id = str(entity_id)
+    db.query(Ref).filter(Ref.entity_type == entity_type, Ref.entity_id == entity_id)\
+        .delete(synchronize_session=False)
+    seen = set()
+    for field, urls in urls_by_field.items():
+        for url in urls:
+            public_id = extract_public_id(url)
+            if not public_id or (public_id, field) in seen:
+                continue
+            seen.add((public_id, field))
+            db.add(Ref(public_id=public_id, entity_type=entity_type, entity_id=entity_id,
+                       field=field, label=label, url=url))
+
+
+def remove_entity(db: Session, entity_type: str, entity_id):
+    db.query(Ref).filter(Ref.entity_type == entity_type, Ref.entity_id == str(entity_id))\
+        .delete(synchronize_session=False)
+
+
+def index_config(db: Session, config: schemas.SiteConfig):
+    remove_entity(db, "site_config", config.id)
+    # Config images get their own labels, so index each field separately
+    for field, label in (("profile_image", "Profile Image"), ("about_image", "About Image")):
+        url = getattr(config, field)
+        public_id = extract_public_id(url)
+        if public_id:
+            db.add(Ref(public_id=public_id, entity_type="site_config", entity_id=str(config.id),
+                       field=field, label=label, url=url))
+
+
+def index_project(db: Session, project: schemas.Project):
+    _replace(db, "project", project.id, f"Project: {project.title}",
+             {"image": [project.image] if project.image else []})
+
+
+def index_post(db: Session, post: schemas.BlogPost):
+    _replace(db, "blog_post", post.id, f"Blog: {post.title}", {
+        "cover_image": [post.cover_image] if post.cover_image else [],
+        "content": find_content_images(post.content),
+    })
+
+
+def index_experience(db: Session, experience: schemas.Experience):
+    _replace(db, "experience", experience.id, f"Experience: {experience.company}",
+             {"company_logo": [experience.company_logo] if experience.company_logo else []})
+
+
+def rebuild_references(db: Session) -> int:
+    """Re-indexes every entity from scratch (backfill / repair). Returns the row count."""
+    db.query(Ref).delete(synchronize_session=False)
+    config = db.query(schemas.SiteConfig).filter(schemas.SiteConfig.id == 1).first()
+    if config:
+        index_config(db, config)
+    for project in db.query(schemas.Project).all():
+        index_project(db, project)
+    for post in db.query(schemas.BlogPost).all():
+        index_post(db, post)
+    for experience in db.query(schemas.Experience).all():
+        index_experience(db, experience)
+    # Marker: the index now covers content written before it existed
+    state = db.query(State).filter(State.id == 1).first()
+    if not state:
+        state = State(id=1, status="idle")
+        db.add(state)
+    state.references_backfilled_at = utcnow()
+    db.commit()
+    return db.query(Ref).count()
+
+
+def is_backfilled(db: Session) -> bool:
+    """
+    Whether rebuild_references has run. Content writes add rows on their own, so a
+    non-empty table does not mean older content is indexed.
+    """
+    state = db.query(State).filter(State.id == 1).first()
+    return bool(state and state.references_backfilled_at)
+
+
+def usage_by_public_id(db: Session) -> dict:
+    """public_id -> sorted, de-duplicated usage labels."""
+    usage = defaultdict(set)
+    for public_id, label in db.query(Ref.public_id, Ref.label).all():
+        usage[public_id].add(label)
+    return {public_id: sorted(labels) for public_id, labels in usage.items()}
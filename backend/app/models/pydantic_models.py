@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
+from datetime import datetime
 
 class ProjectBase(BaseModel):
     id: str
@@ -113,14 +114,18 @@ class GuestbookEntryBase(BaseModel):
     message: str
 
 class GuestbookEntryCreate(GuestbookEntryBase):
-    pass
+    name: str = Field(min_length=1, max_length=80)
+    message: str = Field(min_length=1, max_length=2000)
 
 class GuestbookEntry(GuestbookEntryBase):
     id: int
     approved: int # 0/1
-    created_at: str
+    created_at: datetime
     model_config = ConfigDict(from_attributes=True)
 
+class GuestbookBulkAction(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=500)
+
 class BlogPostBase(BaseModel):
     title: str
     slug: str
@@ -140,6 +145,21 @@ class BlogPost(BlogPostBase):
     updated_at: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
 
+class BlogPostSummary(BaseModel):
+    """List view of a post: everything except the Markdown body."""
+    id: int
+    title: str
+    slug: str
+    excerpt: str
+    tags: str
+    cover_image: Optional[str] = None
+    published: bool
+    created_at: str
+    updated_at: Optional[str] = None
+    reaction_total: Optional[int] = 0  # None where the listing leaves the totals out
+    reaction_counts: Optional[Dict[str, int]] = None
+    model_config = ConfigDict(from_attributes=True)
+
 class BlogReactionBase(BaseModel):
     slug: str
     reaction_type: str
@@ -149,8 +169,20 @@ class BlogReactionCreate(BlogReactionBase):
     pass
 
 class BlogReaction(BlogReactionBase):
-    id: int
+    id: Optional[int] = None  # None until the reaction flusher has written the row
     model_config = ConfigDict(from_attributes=True)
 
-
-
+class IngestionJob(BaseModel):
+    id: int
+    status: str
+    full: bool
+    worker: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    chunks_fetched: int = 0
+    chunks_embedded: int = 0
+    chunks_upserted: int = 0
+    chunks_removed: int = 0
+    model_config = ConfigDict(from_attributes=True)
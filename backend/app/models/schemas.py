@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, JSON, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, JSON, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -103,7 +103,11 @@ class GuestbookEntry(Base):
     name = Column(String)
     message = Column(Text)
     approved = Column(Integer, default=0) # 0=Pending, 1=Approved
-    created_at = Column(String) # ISO timestamp
+    created_at = Column(DateTime, nullable=False)
+
+    # Moderation queue (pending first, newest first) and the public approved list
+    # are both keyset-paginated on this index
+    __table_args__ = (Index('ix_guestbook_approved_created', 'approved', created_at.desc(), id.desc()),)
 
 class BlogPost(Base):
     __tablename__ = "blog_posts"
@@ -118,6 +122,16 @@ class BlogPost(Base):
     published = Column(Boolean, default=False)
     created_at = Column(String) # ISO timestamp
     updated_at = Column(String, nullable=True) # ISO timestamp used for "Last Updated"
+    # Denormalized from blog_reactions by the reaction flusher (app/reaction_counter.py)
+    reaction_total = Column(Integer, nullable=False, default=0, server_default="0")
+    reaction_counts = Column(JSON, nullable=True)  # {"heart": 3, "fire": 1}
+
+    # Keyset pagination of listings: ORDER BY created_at DESC, id DESC,
+    # or ORDER BY reaction_total DESC, created_at DESC, id DESC for ?sort=popular
+    __table_args__ = (
+        Index('ix_blog_posts_published_created', 'published', 'created_at', 'id'),
+        Index('ix_blog_posts_published_popular', 'published', 'reaction_total', 'created_at', 'id'),
+    )
 
 class Experience(Base):
     __tablename__ = "experiences"
@@ -142,3 +156,109 @@ class BlogReaction(Base):
     
     # Composite unique index to ensure one row per slug+type
     __table_args__ = (UniqueConstraint('slug', 'reaction_type', name='uix_slug_reaction'),)
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, index=True, default="queued")  # queued | running | completed | failed
+    full = Column(Boolean, default=False)  # Re-embed everything instead of an incremental sync
+    worker = Column(String, nullable=True)  # host:pid of the process that claimed the job
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Refreshed with every progress update
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+
+    # Per-stage progress counters
+    chunks_fetched = Column(Integer, default=0)
+    chunks_embedded = Column(Integer, default=0)
+    chunks_upserted = Column(Integer, default=0)
+    chunks_removed = Column(Integer, default=0)
+
+    # At most one queued or running job: the indexed expression is constant over the rows the
+    # partial index covers, so a second active job violates uniqueness (single-flight)
+    __table_args__ = (
+        Index(
+            'ix_ingestion_jobs_single_active', text("(status IN ('queued', 'running'))"), unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')")
+        ),
+    )
+
+class MediaReference(Base):
+    __tablename__ = "media_references"
+
+    id = Column(Integer, primary_key=True, index=True)
+    public_id = Column(String, index=True, nullable=False)  # Cloudinary public_id
+    entity_type = Column(String, nullable=False)  # site_config | project | blog_post | experience
+    entity_id = Column(String, nullable=False)
+    field = Column(String, nullable=False)  # e.g. "cover_image", "content"
+    label = Column(String)  # Shown in the media audit, e.g. "Blog: Title"
+    url = Column(String)
+
+    __table_args__ = (Index('ix_media_references_entity', 'entity_type', 'entity_id'),)
+
+class MediaAsset(Base):
+    __tablename__ = "media_assets"
+
+    # Local mirror of the Cloudinary image inventory (see app/media_inventory.py)
+    public_id = Column(String, primary_key=True)
+    url = Column(String)
+    secure_url = Column(String)
+    format = Column(String)
+    width = Column(Integer)
+    height = Column(Integer)
+    bytes = Column(Integer)
+    created_at = Column(String, index=True)  # ISO timestamp from Cloudinary
+    synced_at = Column(DateTime)
+
+class MediaSyncState(Base):
+    __tablename__ = "media_sync_state"
+
+    id = Column(Integer, primary_key=True)  # Singleton: always 1
+    status = Column(String, default="idle")  # idle | syncing | failed
+    started_at = Column(DateTime, nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)  # Last successful sync of any kind
+    last_full_sync_at = Column(DateTime, nullable=True)
+    newest_created_at = Column(String, nullable=True)  # High-water mark for incremental syncs
+    error = Column(Text, nullable=True)
+    # Set by media_refs.rebuild_references; until then media_references may miss older content
+    references_backfilled_at = Column(DateTime, nullable=True)
+
+class MediaDeletion(Base):
+    __tablename__ = "media_deletions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    public_id = Column(String, index=True, nullable=False)
+    status = Column(String, index=True, default="pending")  # pending | processing | done | failed
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=False)
+    claimed_by = Column(String, nullable=True)  # Drainer that is processing the row
+    claimed_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    result = Column(String, nullable=True)  # Cloudinary's per-id result, e.g. "deleted" | "not_found"
+    error = Column(Text, nullable=True)
+
+class SiteRebuildState(Base):
+    __tablename__ = "site_rebuild_state"
+
+    id = Column(Integer, primary_key=True)  # Singleton: always 1
+    pending = Column(Boolean, default=False)  # A rebuild was requested and not dispatched yet
+    pending_count = Column(Integer, default=0)  # Requests coalesced into the pending rebuild
+    first_requested_at = Column(DateTime, nullable=True)
+    last_requested_at = Column(DateTime, nullable=True)
+    last_reason = Column(String, nullable=True)  # e.g. "blog: updated my-post"
+    last_dispatched_at = Column(DateTime, nullable=True)
+    last_dispatch_status = Column(String, nullable=True)  # dispatched | failed | skipped
+    last_dispatch_count = Column(Integer, default=0)  # Requests covered by the last dispatch
+    last_error = Column(Text, nullable=True)
+    dispatch_total = Column(Integer, default=0)
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # Bumped in the same transaction as every write to the named table (see app/http_cache.py)
+    name = Column(String, primary_key=True)  # __tablename__ of the content table
+    version = Column(Integer, default=0, nullable=False)
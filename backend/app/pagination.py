@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import DateTime, and_, or_
+from sqlalchemy.sql import operators
+
+# Keyset (cursor) pagination helpers. A cursor is the opaque, URL-safe encoding of the
+# sort key of the last row on a page; the next page starts strictly after it, so pages
+# stay stable while rows are inserted and the DB never scans skipped rows like OFFSET.
+# Sort columns are descending; wrap one in .asc() to sort it ascending instead.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _direction(column):
+    """(column, ascending): a bare column sorts descending, column.asc() ascending."""
+    if getattr(column, "modifier", None) is operators.asc_op:
+        return column.element, True
+    return column, False
+
+
+def _parse(column, value):
+    """Cursor values are JSON; timestamps travel as ISO strings."""
+    if isinstance(column.type, DateTime) and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def after(columns, values):
+    """Rows that follow `values` in (columns...) order."""
+    clauses = []
+    columns = [_direction(c) for c in columns]
+    for i, (column, ascending) in enumerate(columns):
+        equal = [c == v for (c, _), v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*equal, column > values[i] if ascending else column < values[i]))
+    return or_(*clauses)
+
+
+def paginate(query, columns, cursor: str | None, limit: int | None, response, key):
+    """
+    Orders `query` by `columns` (descending unless wrapped in .asc()) and returns one page.
+    When more rows exist, the cursor for the next page is set in the X-Next-Cursor header.
+    `key(row)` returns the sort-key values of a row.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(columns))
+        values = [_parse(_direction(c)[0], v) for c, v in zip(columns, values)]
+        query = query.filter(after(columns, values))
+    query = query.order_by(*[c if _direction(c)[1] else c.desc() for c in columns])
+    if not limit:
+        return query.all()
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -0,0 +1,144 @@
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from app.vector_store import KB_DATA_DIR
+
+# "sqlite" shares buckets between the gunicorn workers on a host; "memory" is per process
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "sqlite").lower()
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", os.path.join(KB_DATA_DIR, "rate_limits.sqlite3"))
+# Buckets untouched for this long are full again, so they can be dropped
+RATE_LIMIT_IDLE_SECONDS = 3600
+RATE_LIMIT_MAX_KEYS = 10000
+# Reverse proxies in front of the app that append to X-Forwarded-For (Render and Vercel: one).
+# The client is the address the outermost trusted proxy saw; entries left of it are client-supplied
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1" if os.getenv("RENDER") or os.getenv("VERCEL") else "0"))
+
+
+class MemoryBucketStore:
+    """Per-process token buckets with LRU/idle eviction (constant memory per key)."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, idle_seconds: int = RATE_LIMIT_IDLE_SECONDS):
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, refill_per_second: float, now: float) -> tuple[bool, float]:
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            allowed, tokens, retry_after = _refill_and_take(tokens, updated_at, capacity, refill_per_second, now)
+            self._buckets[key] = (tokens, now)
+
+            # Oldest entries sit at the front; drop idle ones and cap the key count
+            while self._buckets:
+                oldest_key, (_, oldest_at) = next(iter(self._buckets.items()))
+                if len(self._buckets) <= self.max_keys and now - oldest_at < self.idle_seconds:
+                    break
+                del self._buckets[oldest_key]
+            return allowed, retry_after
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file, shared by every worker process on the host."""
+
+    def __init__(self, db_path: str = RATE_LIMIT_DB, idle_seconds: int = RATE_LIMIT_IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._calls = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_buckets_updated_at ON buckets (updated_at)")
+
+    def take(self, key: str, capacity: float, refill_per_second: float, now: float) -> tuple[bool, float]:
+        with self._lock:
+            # BEGIN IMMEDIATE serializes the read-modify-write across processes
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                allowed, tokens, retry_after = _refill_and_take(tokens, updated_at, capacity, refill_per_second, now)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+                self._calls += 1
+                if self._calls % 500 == 0:
+                    self._db.execute("DELETE FROM buckets WHERE updated_at < ?", (now - self.idle_seconds,))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            return allowed, retry_after
+
+
+def _refill_and_take(tokens, updated_at, capacity, refill_per_second, now):
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / refill_per_second
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if RATE_LIMIT_STORE == "sqlite":
+                    try:
+                        _store = SQLiteBucketStore()
+                    except (OSError, sqlite3.Error) as e:
+                        # e.g. read-only filesystem on Vercel
+                        print(f"⚠️ Shared rate limit store unavailable, using in-process buckets: {e}")
+                if _store is None:
+                    _store = MemoryBucketStore()
+    return _store
+
+
+def client_ip(request: Request) -> str:
+    """Client address, read from X-Forwarded-For behind TRUSTED_PROXY_HOPS proxies."""
+    if TRUSTED_PROXY_HOPS > 0:
+        hops = [h.strip() for h in request.headers.get("x-forwarded-for", "").split(",") if h.strip()]
+        if hops:
+            return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    FastAPI dependency enforcing max_requests per period seconds per client IP.
+    Token bucket: bursts up to max_requests, then refills steadily.
+
+        @router.post("/", dependencies=[Depends(RateLimit("guestbook", 5, 600))])
+    """
+
+    def __init__(self, name: str, max_requests: int, period: int):
+        self.name = name
+        self.capacity = float(max_requests)
+        self.refill_per_second = max_requests / period
+
+    def __call__(self, request: Request):
+        try:
+            allowed, retry_after = get_store().take(
+                f"{self.name}:{client_ip(request)}", self.capacity, self.refill_per_second, time.time()
+            )
+        except Exception as e:
+            # Never fail a request because the limiter's store is unavailable
+            print(f"⚠️ Rate limiter error: {e}")
+            return
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded.",
+                headers={"Retry-After": str(int(retry_after) + 1)}
+            )
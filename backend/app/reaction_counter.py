@@ -0,0 +1,159 @@
+import os
+import time
+import atexit
+import threading
+from collections import defaultdict
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import schemas
+from app import http_cache
+
+# Write-behind reaction counters. Clicks only add to an in-memory delta per worker; a
+# flusher thread folds the deltas into blog_reactions with one atomic upsert
+# (count = count + n) per flush, so a burst of clicks costs O(1) DB writes and
+# concurrent clicks can neither lose increments nor race on uix_slug_reaction.
+REACTION_FLUSH_SECONDS = float(os.getenv("REACTION_FLUSH_SECONDS", "5"))
+# Flush early once this many clicks are pending in a worker
+REACTION_FLUSH_MAX_PENDING = int(os.getenv("REACTION_FLUSH_MAX_PENDING", "200"))
+# A click that has waited this long is flushed by the request that sees it (flusher thread stalled,
+# or frozen between invocations on serverless hosts)
+REACTION_FLUSH_MAX_AGE_SECONDS = float(os.getenv("REACTION_FLUSH_MAX_AGE_SECONDS", "15"))
+
+Reaction = schemas.BlogReaction
+Post = schemas.BlogPost
+
+
+def _upsert_counts(db: Session, deltas: dict):
+    """Adds {(slug, reaction_type): n} to blog_reactions with INSERT ... ON CONFLICT DO UPDATE."""
+    rows = [{"slug": slug, "reaction_type": reaction_type, "count": n}
+            for (slug, reaction_type), n in deltas.items()]
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        stmt = insert(Reaction.__table__).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["slug", "reaction_type"],
+            set_={"count": Reaction.__table__.c.count + stmt.excluded.count}
+        )
+        db.execute(stmt)
+        return
+
+    # Other dialects: atomic increment, insert when the row does not exist yet
+    for row in rows:
+        updated = db.query(Reaction)\
+            .filter(Reaction.slug == row["slug"], Reaction.reaction_type == row["reaction_type"])\
+            .update({"count": Reaction.count + row["count"]}, synchronize_session=False)
+        if not updated:
+            db.add(Reaction(**row))
+
+
+def refresh_post_totals(db: Session, slugs):
+    """Recomputes blog_posts.reaction_total / reaction_counts for `slugs` from blog_reactions."""
+    counts = {}
+    rows = db.query(Reaction.slug, Reaction.reaction_type, func.sum(Reaction.count))\
+        .filter(Reaction.slug.in_(slugs))\
+        .group_by(Reaction.slug, Reaction.reaction_type)
+    for slug, reaction_type, count in rows:
+        counts.setdefault(slug, {})[reaction_type] = int(count)
+    for slug in slugs:
+        by_type = counts.get(slug, {})
+        db.query(Post).filter(Post.slug == slug).update(
+            {"reaction_total": sum(by_type.values()), "reaction_counts": by_type},
+            synchronize_session=False)
+
+
+class ReactionCounter:
+    def __init__(self):
+        self._pending = defaultdict(int)
+        self._pending_total = 0
+        self._oldest_at = 0.0  # monotonic time of the oldest unflushed click
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def increment(self, slug: str, reaction_type: str, n: int = 1):
+        """
+        Buffers a click. Without a running flusher thread (e.g. on Vercel, where startup hooks
+        and background threads can't be relied on) the click is written right away, and a
+        buffer older than REACTION_FLUSH_MAX_AGE_SECONDS is written by the caller, so a killed
+        worker loses at most that window (or REACTION_FLUSH_MAX_PENDING clicks).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending_total:
+                self._oldest_at = now
+            self._pending[(slug, reaction_type)] += n
+            self._pending_total += n
+            flusher_running = self._thread is not None and self._thread.is_alive()
+            overdue = now - self._oldest_at >= REACTION_FLUSH_MAX_AGE_SECONDS
+            if self._pending_total >= REACTION_FLUSH_MAX_PENDING:
+                self._wakeup.set()
+        if not flusher_running or overdue:
+            self.flush()
+
+    def pending_for(self, slug: str) -> dict:
+        """Unflushed deltas of this worker for one post: {reaction_type: n}."""
+        with self._lock:
+            return {t: n for (s, t), n in self._pending.items() if s == slug}
+
+    def flush(self) -> int:
+        """Writes all pending deltas in one transaction. Returns the number of clicks flushed."""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._pending = self._pending, defaultdict(int)
+                flushed, self._pending_total = self._pending_total, 0
+                oldest_at = self._oldest_at
+            if not deltas:
+                return 0
+
+            db = SessionLocal()
+            try:
+                slugs = sorted({slug for slug, _ in deltas})
+                # Lock the posts (in id order) before the upsert, so flushes from different workers
+                # touching the same posts run one after the other and each recount sees the other's rows
+                db.query(Post.id).filter(Post.slug.in_(slugs)).order_by(Post.id).with_for_update().all()
+                _upsert_counts(db, deltas)
+                refresh_post_totals(db, slugs)
+                # The post totals have their own version: only listings that serve them
+                # (?sort=popular) revalidate, not every cached post
+                http_cache.bump(db, Reaction, http_cache.REACTION_TOTALS)
+                db.commit()
+                return flushed
+            except Exception as e:
+                db.rollback()
+                # Keep the clicks for the next attempt
+                with self._lock:
+                    for key, n in deltas.items():
+                        self._pending[key] += n
+                    self._pending_total += flushed
+                    self._oldest_at = oldest_at
+                print(f"❌ Reaction flush failed ({flushed} pending clicks kept): {e}")
+                return 0
+            finally:
+                db.close()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(REACTION_FLUSH_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self):
+        """Starts this worker's flusher thread (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="reaction-flusher", daemon=True)
+                self._thread.start()
+
+
+reaction_counter = ReactionCounter()
+# Don't drop the last few seconds of clicks when a worker exits
+atexit.register(reaction_counter.flush)
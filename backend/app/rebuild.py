@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+from datetime import timedelta
+import requests
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import schemas
+from app.timestamps import utcnow
+
+# GitHub Auto-Rebuild Configuration
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+GITHUB_REPO_OWNER = 'smaxiso'
+GITHUB_REPO_NAME = 'smaxiso.github.io'
+REBUILD_EVENT_TYPE = "rebuild-blog"  # repository_dispatch type handled by auto-deploy.yml
+
+# Writes only request a rebuild; a scheduler thread dispatches once no new request has
+# arrived for REBUILD_QUIET_SECONDS, so a burst of edits starts a single build. Continuous
+# editing is capped by REBUILD_MAX_DELAY_SECONDS. State lives in the DB so the gunicorn
+# workers coalesce into one dispatch instead of one each.
+REBUILD_QUIET_SECONDS = int(os.getenv("REBUILD_QUIET_SECONDS", "60"))
+REBUILD_MAX_DELAY_SECONDS = int(os.getenv("REBUILD_MAX_DELAY_SECONDS", "600"))
+# While a previous build is still running, check again after this long
+REBUILD_IN_FLIGHT_POLL_SECONDS = 30
+RUN_STATUS_CACHE_SECONDS = 15
+
+State = schemas.SiteRebuildState
+
+_wakeup = threading.Event()
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_run_cache = {"at": 0.0, "run": None}
+
+
+def _get_state(db: Session) -> State:
+    state = db.query(State).filter(State.id == 1).first()
+    if not state:
+        try:
+            db.add(State(id=1, pending=False, pending_count=0, last_dispatch_count=0, dispatch_total=0))
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # Another worker created it first
+        state = db.query(State).filter(State.id == 1).first()
+    return state
+
+
+def request_rebuild(db: Session, reason: str):
+    """
+    Records that public content changed and returns immediately. Call after the content
+    change has been committed; consecutive requests are coalesced into one dispatch.
+    """
+    _get_state(db)
+    now = utcnow()
+    db.query(State).filter(State.id == 1).update({
+        "pending": True,
+        "pending_count": case((State.pending == True, State.pending_count + 1), else_=1),
+        "first_requested_at": case((State.pending == True, State.first_requested_at), else_=now),
+        "last_requested_at": now,
+        "last_reason": reason[:200],
+    }, synchronize_session=False)
+    db.commit()
+    _wakeup.set()
+
+
+def latest_build():
+    """Most recent repository_dispatch workflow run on GitHub (cached briefly), or None."""
+    if not GITHUB_TOKEN:
+        return None
+    if time.time() - _run_cache["at"] < RUN_STATUS_CACHE_SECONDS:
+        return _run_cache["run"]
+    run = None
+    try:
+        response = requests.get(
+            f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/actions/runs",
+            headers={"Accept": "application/vnd.github.v3+json", "Authorization": f"token {GITHUB_TOKEN}"},
+            params={"event": "repository_dispatch", "per_page": 1},
+            timeout=10
+        )
+        if response.status_code == 200:
+            runs = response.json().get("workflow_runs", [])
+            if runs:
+                run = {key: runs[0].get(key) for key in ("id", "status", "conclusion", "html_url", "created_at")}
+    except Exception as e:
+        print(f"⚠️ Could not fetch GitHub build status: {e}")
+    _run_cache.update(at=time.time(), run=run)
+    return run
+
+
+def _build_in_flight() -> bool:
+    run = latest_build()
+    return bool(run and run["status"] in ("queued", "in_progress", "waiting", "pending"))
+
+
+def _dispatch(reason: str, coalesced: int):
+    """Trigger GitHub Actions to rebuild and deploy the site. Returns (status, error)."""
+    if not GITHUB_TOKEN:
+        print("WARNING: GITHUB_TOKEN not set, skipping auto-rebuild")
+        return "skipped", "GITHUB_TOKEN not set"
+
+    try:
+        url = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/dispatches"
+        headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "Authorization": f"token {GITHUB_TOKEN}"
+        }
+        data = {"event_type": REBUILD_EVENT_TYPE, "client_payload": {"reason": reason, "coalesced": coalesced}}
+
+        response = requests.post(url, headers=headers, json=data, timeout=10)
+
+        if response.status_code == 204:
+            print(f"✅ GitHub Actions rebuild triggered successfully ({coalesced} change(s), last: {reason})")
+            _run_cache["at"] = 0.0  # The next status check should see the new run
+            return "dispatched", None
+        print(f"⚠️ GitHub trigger failed with status {response.status_code}: {response.text}")
+        return "failed", f"HTTP {response.status_code}: {response.text[:500]}"
+    except Exception as e:
+        print(f"❌ Error triggering GitHub rebuild: {e}")
+        return "failed", str(e)
+
+
+def _tick() -> float | None:
+    """Dispatches the pending rebuild if it is due. Returns seconds until the next check, or None when idle."""
+    db = SessionLocal()
+    try:
+        state = _get_state(db)
+        if not state.pending:
+            return None
+
+        now = utcnow()
+        quiet_due = state.last_requested_at + timedelta(seconds=REBUILD_QUIET_SECONDS)
+        deadline = state.first_requested_at + timedelta(seconds=REBUILD_MAX_DELAY_SECONDS)
+        if now < quiet_due and now < deadline:
+            return (min(quiet_due, deadline) - now).total_seconds()
+        if now < deadline and _build_in_flight():
+            # Let the running build finish; one build after it covers every change since
+            return REBUILD_IN_FLIGHT_POLL_SECONDS
+
+        reason, coalesced = state.last_reason or "content changed", state.pending_count or 1
+        # Claim: only succeeds if no new request arrived and no other worker claimed it
+        claimed = db.query(State)\
+            .filter(State.id == 1, State.pending == True, State.last_requested_at == state.last_requested_at)\
+            .update({"pending": False, "pending_count": 0, "last_dispatched_at": now}, synchronize_session=False)
+        db.commit()
+        if claimed != 1:
+            return 0
+
+        status, error = _dispatch(reason, coalesced)
+        db.query(State).filter(State.id == 1).update({
+            "last_dispatch_status": status,
+            "last_error": error,
+            "last_dispatch_count": coalesced,
+            "dispatch_total": State.dispatch_total + 1,
+        }, synchronize_session=False)
+        db.commit()
+        return 0
+    finally:
+        db.close()
+
+
+def _run():
+    while True:
+        _wakeup.wait()
+        _wakeup.clear()
+        try:
+            delay = _tick()
+            while delay is not None:
+                _wakeup.wait(delay)
+                _wakeup.clear()
+                delay = _tick()
+        except Exception as e:
+            print(f"❌ Rebuild scheduler error: {e}")
+
+
+def start_scheduler():
+    """Starts this worker's rebuild scheduler thread (idempotent)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = threading.Thread(target=_run, name="rebuild-scheduler", daemon=True)
+            _scheduler.start()
+            _wakeup.set()  # Dispatch a rebuild left pending before a restart
+
+
+def rebuild_status(db: Session) -> dict:
+    state = _get_state(db)
+    due_at = None
+    if state.pending:
+        due_at = min(state.last_requested_at + timedelta(seconds=REBUILD_QUIET_SECONDS),
+                     state.first_requested_at + timedelta(seconds=REBUILD_MAX_DELAY_SECONDS))
+    return {
+        "pending": bool(state.pending),
+        "pendingChanges": state.pending_count or 0,
+        "dueAt": due_at.isoformat() if due_at else None,
+        "lastReason": state.last_reason,
+        "lastDispatchedAt": state.last_dispatched_at.isoformat() if state.last_dispatched_at else None,
+        "lastDispatchStatus": state.last_dispatch_status,
+        "lastDispatchChanges": state.last_dispatch_count or 0,
+        "lastError": state.last_error,
+        "dispatchTotal": state.dispatch_total or 0,
+        "quietSeconds": REBUILD_QUIET_SECONDS,
+        "build": latest_build(),
+    }
@@ -0,0 +1,74 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Semantic cache for /chat answers. A hit needs a near-identical question (cosine
+# similarity of the query embeddings) answered against the same knowledge base version.
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "256"))
+CHAT_CACHE_TTL_SECONDS = int(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+CHAT_CACHE_MIN_SIMILARITY = float(os.getenv("CHAT_CACHE_MIN_SIMILARITY", "0.95"))
+
+
+class _Entry:
+    __slots__ = ("vector", "chunks", "kb_version", "expires_at")
+
+    def __init__(self, vector, chunks, kb_version, expires_at):
+        self.vector = vector
+        self.chunks = chunks
+        self.kb_version = kb_version
+        self.expires_at = expires_at
+
+
+class SemanticResponseCache:
+    """Per-worker LRU of streamed answers with TTL expiry and version-stamp invalidation."""
+
+    def __init__(self, max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+                 ttl_seconds: int = CHAT_CACHE_TTL_SECONDS,
+                 min_similarity: float = CHAT_CACHE_MIN_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_similarity = min_similarity
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict_stale(self, kb_version, now):
+        for key in [k for k, e in self._entries.items() if e.kb_version != kb_version or e.expires_at <= now]:
+            del self._entries[key]
+
+    def get(self, query_vector, kb_version) -> list[str] | None:
+        """Returns the streamed chunks of a cached answer to a near-identical question."""
+        q = np.asarray(query_vector, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        with self._lock:
+            self._evict_stale(kb_version, time.time())
+            if self._entries:
+                keys = list(self._entries)
+                scores = np.vstack([self._entries[k].vector for k in keys]) @ q
+                best = int(np.argmax(scores))
+                if scores[best] >= self.min_similarity:
+                    self._entries.move_to_end(keys[best])
+                    self.hits += 1
+                    return self._entries[keys[best]].chunks
+            self.misses += 1
+            return None
+
+    def put(self, query_vector, kb_version, chunks: list[str]):
+        q = np.asarray(query_vector, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        with self._lock:
+            self._entries[self._next_key] = _Entry(q, chunks, kb_version, time.time() + self.ttl_seconds)
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = SemanticResponseCache()
@@ -1,6 +1,5 @@
 import os
 import cloudinary
-import cloudinary.uploader
 import re
 
 # Configure Cloudinary (ensure these env vars are set)
@@ -11,29 +10,68 @@ cloudinary.config(
     api_secret=os.getenv('CLOUDINARY_API_SECRET')
 )
 
-def delete_cloudinary_image(image_url: str):
+from app.media_deletions import enqueue_deletions
+
+# Markdown images ![alt](url) and HTML <img src="url">
+CONTENT_IMAGE_PATTERN = re.compile(r'(?:!\[.*?\]\((https?://[^)]+)\))|(?:src=["\'](https?://[^"\']+)["\'])')
+
+def find_content_images(content: str):
+    """Returns the image URLs embedded in markdown/HTML content, in order of appearance."""
+    if not content:
+        return []
+    # findall returns tuples (markdown_url, html_url); keep the non-empty one
+    return [next(m for m in match if m) for match in CONTENT_IMAGE_PATTERN.findall(content)]
+
+# A transformation segment is one or more comma-separated <param>_<value> components,
+# e.g. "c_fill,w_400", "t_thumb" or "f_auto,q_auto". Only known parameter keys count, so
+# folders such as "my_photos/" are not mistaken for transformations.
+TRANSFORMATION_KEYS = ("a|ac|af|ar|b|bo|br|c|co|cs|d|dl|dn|dpr|du|e|eo|f|fl|fn|fps|g|h|if|ki|l|o|"
+                       "p|pg|q|r|so|sp|t|u|vc|vs|w|x|y|z")
+TRANSFORMATION_SEGMENT = re.compile(rf'^(?:{TRANSFORMATION_KEYS})_[^/,]+(?:,(?:{TRANSFORMATION_KEYS})_[^/,]+)*$')
+
+def extract_public_id(image_url: str):
+    """
+    Extracts the Cloudinary public_id from a delivery URL, or None for non-Cloudinary URLs.
+    Expected format: https://res.cloudinary.com/<cloud_name>/image/upload/[<transformations>/]v<version>/<public_id>.<ext>
+
+    >>> extract_public_id("https://res.cloudinary.com/demo/image/upload/v1712/portfolio/me.jpg")
+    'portfolio/me'
+    >>> extract_public_id("https://res.cloudinary.com/demo/image/upload/c_fill,w_400/v1712/portfolio/me.jpg")
+    'portfolio/me'
+    >>> extract_public_id("https://res.cloudinary.com/demo/image/upload/c_fill,w_400/portfolio/me.jpg")
+    'portfolio/me'
+    >>> extract_public_id("https://res.cloudinary.com/demo/image/upload/c_fill,g_face/f_auto,q_auto/me.png?_a=1")
+    'me'
+    >>> extract_public_id("https://res.cloudinary.com/demo/image/upload/my_photos/me.jpg")
+    'my_photos/me'
+    >>> extract_public_id("https://example.com/me.jpg") is None
+    True
+    """
+    if not image_url or "/upload/" not in image_url:
+        return None
+    path = image_url.split("?", 1)[0]
+    # With a version segment everything after it is the public_id (handles folders and transformations)
+    match = re.search(r'/upload/(?:.*?/)?v\d+/(.+?)(?:\.[a-zA-Z0-9]+)?$', path)
+    if match:
+        return match.group(1)
+    # Without one, leading transformation segments precede the public_id
+    segments = path.split("/upload/", 1)[1].split("/")
+    while len(segments) > 1 and TRANSFORMATION_SEGMENT.match(segments[0]):
+        segments.pop(0)
+    match = re.match(r'(.+?)(?:\.[a-zA-Z0-9]+)?$', "/".join(segments))
+    return match.group(1) if match else None
+
+def delete_cloudinary_image(db, image_url: str):
     """
-    Deletes an image from Cloudinary given its URL.
-    Extracts the public_id from the URL and calls the destroy API.
+    Queues an image for deletion from Cloudinary given its URL.
+    Extracts the public_id from the URL; the deletion runs in the background once the
+    caller's transaction commits (see app/media_deletions.py).
     """
     if not image_url:
         return
 
-    try:
-        # Expected format: https://res.cloudinary.com/<cloud_name>/image/upload/v<version>/<public_id>.<ext>
-        # We need to extract <public_id>
-        
-        # Regex to find everything after the version number (v\d+/) and before the extension
-        # This handles cases with folders if public_id includes slashes
-        match = re.search(r'/upload/(?:v\d+/)?(.+?)\.[a-zA-Z]+$', image_url)
-        
-        if match:
-            public_id = match.group(1)
-            print(f"🗑️ Attempting to delete Cloudinary image: {public_id}")
-            result = cloudinary.uploader.destroy(public_id)
-            print(f"✅ Cloudinary delete result: {result}")
-        else:
-            print(f"⚠️ Could not extract public_id from URL: {image_url}")
-
-    except Exception as e:
-        print(f"❌ Error deleting Cloudinary image: {e}")
+    public_id = extract_public_id(image_url)
+    if public_id:
+        enqueue_deletions(db, [public_id])
+    else:
+        print(f"⚠️ Could not extract public_id from URL: {image_url}")
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import threading
+import numpy as np
+from dotenv import load_dotenv
+from app.clients import get_pinecone_index
+
+load_dotenv()
+
+# Retrieval backend for the chat endpoint: "local" (default) | "pinecone".
+# "local" falls back to Pinecone while the local index is missing or empty (e.g. before the first ingestion).
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "local").lower()
+
+INDEX_NAME = "portfolio-index"  # Pinecone index name (synchronized with ingest_v2.py)
+EMBEDDING_DIM = 768  # Gemini text-embedding-004
+
+# Where the local index lives. All gunicorn workers on a host share these files.
+KB_DATA_DIR = os.getenv("KB_DATA_DIR", os.path.join(os.path.dirname(__file__), "../data"))
+LOCAL_INDEX_DIR = os.path.join(KB_DATA_DIR, "kb_index")
+
+VECTORS_FILE = "vectors.npy"
+META_FILE = "meta.jsonl"
+VERSION_FILE = "VERSION"
+
+
+class Match:
+    """Mirrors the shape of a Pinecone query match (id, score, metadata)."""
+    __slots__ = ("id", "score", "metadata")
+
+    def __init__(self, id: str, score: float, metadata: dict):
+        self.id = id
+        self.score = score
+        self.metadata = metadata
+
+
+def _normalize(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+def read_index_version(path: str = LOCAL_INDEX_DIR) -> str | None:
+    """Returns the version stamp written by the last committed ingestion, if any."""
+    try:
+        with open(os.path.join(path, VERSION_FILE)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+class LocalVectorIndex:
+    """
+    Memory-resident cosine index over the knowledge base.
+    Vectors are stored L2-normalized in a .npy file and memory-mapped, so every
+    worker on the host shares the same pages and a query is a single mat-vec.
+    """
+
+    def __init__(self, path: str = LOCAL_INDEX_DIR):
+        self.path = path
+        self.version = read_index_version(path)
+        self.ids: list[str] = []
+        self.metadata: list[dict] = []
+        self.types = np.empty(0, dtype=object)
+        self.vectors = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._centroids = {}
+
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        meta_path = os.path.join(path, META_FILE)
+        if not self.version or not os.path.exists(vectors_path):
+            return
+
+        with open(meta_path) as f:
+            for line in f:
+                row = json.loads(line)
+                self.ids.append(row["id"])
+                self.metadata.append(row["metadata"])
+        vectors = np.load(vectors_path, mmap_mode="r")
+        if vectors.shape[0] != len(self.ids):
+            # Caught mid-commit: stay empty and let the next version check reload
+            self.version = None
+            self.ids, self.metadata = [], []
+            return
+        self.types = np.array([m.get("type", "") for m in self.metadata], dtype=object)
+        self.vectors = vectors
+
+    def __len__(self):
+        return len(self.ids)
+
+    def centroids(self, label_map: dict[str, str]) -> tuple[list[str], np.ndarray]:
+        """
+        Mean direction of the chunks of each label, computed once per loaded version.
+        label_map maps chunk metadata types to labels (e.g. 'readme' -> 'project').
+        """
+        key = tuple(sorted(label_map.items()))
+        cached = self._centroids.get(key)
+        if cached is None:
+            labels, rows = [], []
+            for label in sorted(set(label_map.values())):
+                types = [t for t, l in label_map.items() if l == label]
+                mask = np.isin(self.types, types)
+                if mask.any():
+                    labels.append(label)
+                    rows.append(_normalize(np.asarray(self.vectors[mask]).mean(axis=0)))
+            matrix = np.vstack(rows) if rows else np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+            cached = self._centroids[key] = (labels, matrix)
+        return cached
+
+    def query(self, vector, top_k: int = 5, type_filter: str | None = None) -> list[Match]:
+        if not len(self):
+            return []
+
+        scores = self.vectors @ _normalize(vector)
+        if type_filter:
+            scores = np.where(self.types == type_filter, scores, -np.inf)
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            Match(self.ids[i], float(scores[i]), self.metadata[i])
+            for i in top if np.isfinite(scores[i])
+        ]
+
+
+class LocalIndexWriter:
+    """
+    Pinecone-compatible sink (upsert/delete) used by ingestion to build the local index.
+    Upserted rows are staged on disk; commit() writes the merged index next to the
+    live one and swaps it in atomically, then bumps the version stamp.
+    """
+
+    def __init__(self, path: str = LOCAL_INDEX_DIR, keep_existing: bool = True):
+        self.path = path
+        self.keep_existing = keep_existing
+        os.makedirs(path, exist_ok=True)
+
+        self._staged_vectors_path = os.path.join(path, "staged.f32")
+        self._staged_meta_path = os.path.join(path, "staged.jsonl")
+        self._staged_vectors = open(self._staged_vectors_path, "wb")
+        self._staged_meta = open(self._staged_meta_path, "w")
+        self._staged_rows: dict[str, int] = {}  # id -> latest staged row
+        self._staged_count = 0
+        self._deleted: set[str] = set()
+
+    def upsert(self, vectors: list[dict]):
+        for v in vectors:
+            self._staged_vectors.write(_normalize(v["values"]).tobytes())
+            self._staged_meta.write(json.dumps({"id": v["id"], "metadata": v.get("metadata", {})}) + "\n")
+            self._staged_rows[v["id"]] = self._staged_count
+            self._deleted.discard(v["id"])
+            self._staged_count += 1
+
+    def delete(self, ids: list[str]):
+        for i in ids:
+            self._staged_rows.pop(i, None)
+            self._deleted.add(i)
+
+    def discard(self):
+        """Drops the staged rows without touching the live index."""
+        self._staged_vectors.close()
+        self._staged_meta.close()
+        os.remove(self._staged_vectors_path)
+        os.remove(self._staged_meta_path)
+
+    def commit(self) -> str:
+        self._staged_vectors.close()
+        self._staged_meta.close()
+
+        existing = LocalVectorIndex(self.path) if self.keep_existing else None
+        kept = [
+            i for i, id_ in enumerate(existing.ids)
+            if id_ not in self._staged_rows and id_ not in self._deleted
+        ] if existing else []
+        staged = np.memmap(self._staged_vectors_path, dtype=np.float32, mode="r",
+                           shape=(self._staged_count, EMBEDDING_DIM)) if self._staged_count else None
+        staged_rows = sorted(self._staged_rows.values())
+
+        tmp_vectors = os.path.join(self.path, VECTORS_FILE + ".tmp")
+        tmp_meta = os.path.join(self.path, META_FILE + ".tmp")
+        total = len(kept) + len(staged_rows)
+        out = np.lib.format.open_memmap(tmp_vectors, mode="w+", dtype=np.float32,
+                                        shape=(total, EMBEDDING_DIM))
+        with open(tmp_meta, "w") as meta_out:
+            row = 0
+            for i in kept:
+                out[row] = existing.vectors[i]
+                meta_out.write(json.dumps({"id": existing.ids[i], "metadata": existing.metadata[i]}) + "\n")
+                row += 1
+            if staged_rows:
+                with open(self._staged_meta_path) as staged_meta:
+                    wanted = set(staged_rows)
+                    for n, line in enumerate(staged_meta):
+                        if n in wanted:
+                            out[row] = staged[n]
+                            meta_out.write(line)
+                            row += 1
+        out.flush()
+        del out, staged, existing
+
+        os.replace(tmp_vectors, os.path.join(self.path, VECTORS_FILE))
+        os.replace(tmp_meta, os.path.join(self.path, META_FILE))
+        os.remove(self._staged_vectors_path)
+        os.remove(self._staged_meta_path)
+
+        version = f"{time.time_ns()}-{total}"
+        tmp_version = os.path.join(self.path, VERSION_FILE + ".tmp")
+        with open(tmp_version, "w") as f:
+            f.write(version)
+        os.replace(tmp_version, os.path.join(self.path, VERSION_FILE))
+        print(f"💾 Local index committed: {total} vectors (version {version})")
+        return version
+
+
+class LocalRetriever:
+    """
+    Serves queries from the local index, reloading it when ingestion commits a new version.
+    Queries go to `fallback` (if set) while the local index is missing or empty.
+    """
+
+    def __init__(self, path: str = LOCAL_INDEX_DIR, fallback=None):
+        self.path = path
+        self.fallback = fallback
+        self._lock = threading.Lock()
+        self._index = LocalVectorIndex(path)
+
+    @property
+    def index(self) -> LocalVectorIndex:
+        version = read_index_version(self.path)
+        if version != self._index.version:
+            with self._lock:
+                if version != self._index.version:
+                    self._index = LocalVectorIndex(self.path)
+                    print(f"🔄 Loaded local index version {version} ({len(self._index)} vectors)")
+        return self._index
+
+    def query(self, vector, top_k: int = 5, type_filter: str | None = None) -> list[Match]:
+        index = self.index
+        if not len(index) and self.fallback is not None:
+            return self.fallback.query(vector, top_k=top_k, type_filter=type_filter)
+        return index.query(vector, top_k=top_k, type_filter=type_filter)
+
+
+class PineconeRetriever:
+    """Remote retrieval through the Pinecone index (handle shared via app.clients)."""
+
+    def query(self, vector, top_k: int = 5, type_filter: str | None = None) -> list[Match]:
+        index = get_pinecone_index(INDEX_NAME)
+        if index is None:
+            return []
+        filter_obj = {"type": {"$eq": type_filter}} if type_filter else None
+        results = index.query(
+            vector=vector,
+            top_k=top_k,
+            include_metadata=True,
+            filter=filter_obj
+        )
+        return [Match(m.id, m.score, m.metadata or {}) for m in results.matches]
+
+
+_retriever = None
+_local_retriever = None
+_retriever_lock = threading.Lock()
+
+def get_local_retriever() -> LocalRetriever:
+    """
+    The worker's local index. Ingestion always writes it, so it is also available
+    (e.g. for intent centroids) when retrieval itself is served by Pinecone.
+    """
+    global _local_retriever
+    if _local_retriever is None:
+        with _retriever_lock:
+            if _local_retriever is None:
+                _local_retriever = LocalRetriever()
+    return _local_retriever
+
+def get_retriever():
+    """Returns the configured retrieval backend (one per worker)."""
+    global _retriever
+    if _retriever is None:
+        if RETRIEVAL_BACKEND == "pinecone":
+            _retriever = PineconeRetriever()
+        else:
+            _retriever = LocalRetriever(fallback=PineconeRetriever())
+    return _retriever
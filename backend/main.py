@@ -55,6 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Retry-After"],  # Pagination and rate limit headers readable by the frontend
 )
 
 # Global error handler to ensure CORS headers are sent even on crashes
@@ -68,6 +69,44 @@ async def global_exception_handler(request, exc):
         headers={"Access-Control-Allow-Origin": "*"}
     )
 
+@app.on_event("startup")
+def warm_retriever():
+    # Load (memory-map) the knowledge base index once per worker instead of on the first chat
+    from app.vector_store import get_retriever
+    try:
+        get_retriever()
+    except Exception as e:
+        print(f"⚠️ Retriever warm-up failed: {e}")
+
+@app.on_event("startup")
+def seed_table_versions():
+    # Version counters behind the ETags of public reads
+    from app.http_cache import ensure_versions
+    ensure_versions()
+
+@app.on_event("startup")
+def start_media_deletion_drainer():
+    # Drains the Cloudinary deletion queue off the request path
+    from app.media_deletions import start_drainer
+    start_drainer()
+
+@app.on_event("startup")
+def start_reaction_flusher():
+    # Writes buffered reaction clicks in periodic batches
+    from app.reaction_counter import reaction_counter
+    reaction_counter.start()
+
+@app.on_event("shutdown")
+def flush_reactions():
+    from app.reaction_counter import reaction_counter
+    reaction_counter.flush()
+
+@app.on_event("startup")
+def start_rebuild_scheduler():
+    # Coalesces content changes into debounced GitHub Actions rebuilds
+    from app.rebuild import start_scheduler
+    start_scheduler()
+
 # Include routers - ORDER MATTERS!
 # Specific routes must come before catch-all routes
 app.include_router(config.router, prefix="/api/v1", tags=["config"])
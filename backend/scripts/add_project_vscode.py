@@ -6,6 +6,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, engine
 from app.models import schemas
+from app import http_cache
 from sqlalchemy.orm import Session
 
 # Create tables if not exist
@@ -34,6 +35,7 @@ def add_vscode_project():
             # Optional: Ensure category is correct
             # project.category = "Open Source" 
             
+            http_cache.bump(db, schemas.Project)
             db.commit()
             print("✅ Success! Project updated.")
         else:
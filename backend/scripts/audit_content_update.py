@@ -7,6 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def audit_update():
     db = SessionLocal()
@@ -59,6 +60,7 @@ def audit_update():
             print(f"Warning: Project '{update['title']}' not found.")
             
     if updated_count > 0:
+        http_cache.bump(db, schemas.Project)
         db.commit()
         print(f"Successfully updated {updated_count} projects.")
     else:
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Rebuild the media reference index (media_references table) from all content and mark
+it as backfilled (media_sync_state.references_backfilled_at). The media audit refuses
+to report orphans until that marker exists.
+Safe to re-run; run once after deploying the table, or to repair it. With --if-needed
+it only runs while the marker is unset (the Render build runs it that way on every deploy).
+Usage: python scripts/backfill_media_refs.py [--if-needed]
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect, text
+from app.database import SessionLocal, engine
+from app.models import schemas
+from app import media_refs
+
+
+def add_marker_column(db):
+    """media_sync_state predates the marker column on existing databases"""
+    columns = {c["name"] for c in inspect(engine).get_columns("media_sync_state")}
+    if "references_backfilled_at" in columns:
+        return
+    print("Adding 'references_backfilled_at' column to media_sync_state table...")
+    column_type = "TIMESTAMP" if engine.dialect.name == "postgresql" else "DATETIME"
+    db.execute(text(f"ALTER TABLE media_sync_state ADD COLUMN references_backfilled_at {column_type}"))
+    db.commit()
+
+
+def backfill(if_needed: bool = False):
+    schemas.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        add_marker_column(db)
+        if if_needed and media_refs.is_backfilled(db):
+            print("✓ Media reference index already backfilled. Skipping.")
+            return
+        count = media_refs.rebuild_references(db)
+        print(f"✓ Indexed {count} media references")
+    except Exception as e:
+        print(f"✗ Backfill failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill(if_needed="--if-needed" in sys.argv[1:])
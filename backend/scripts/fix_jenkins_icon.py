@@ -7,6 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def fix_jenkins_icon():
     db = SessionLocal()
@@ -20,6 +21,7 @@ def fix_jenkins_icon():
     if skill:
         print(f"Updating 'Jenkins' icon: {skill.icon} -> {new_icon}")
         skill.icon = new_icon
+        http_cache.bump(db, schemas.Skill)
         db.commit()
         print("Successfully updated Jenkins icon.")
     else:
@@ -7,6 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def fix_skill_icons():
     db = SessionLocal()
@@ -51,6 +52,7 @@ def fix_skill_icons():
             print(f"Warning: Skill '{name}' not found.")
             
     if updated_count > 0:
+        http_cache.bump(db, schemas.Skill)
         db.commit()
         print(f"\nSuccessfully updated {updated_count} skill icons.")
     else:
@@ -1,6 +1,8 @@
 
 import os
 import sys
+import queue
+import threading
 import google.generativeai as genai
 from pinecone import Pinecone
 from dotenv import load_dotenv
@@ -12,108 +14,267 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from scripts.ingestors.resume import ingest_resume
 from scripts.ingestors.database import ingest_database
 from scripts.ingestors.github import ingest_github
+from scripts.ingestors.manifest import IngestManifest, SourceFailure, chunk_hash, under_failed_parent
+from scripts.ingestors.embedding import embed_chunks, EMBEDDING_MODEL, EMBED_BATCH_SIZE, EMBED_CONCURRENCY
+
+from app.vector_store import INDEX_NAME, EMBEDDING_DIM, RETRIEVAL_BACKEND, LocalIndexWriter, read_index_version
 
 # Load Env
 load_dotenv()
 
-INDEX_NAME = "portfolio-index" # Synchronized with chat.py
-
 def get_services():
     """Lazy configuration for production safety"""
     gemini_key = os.getenv("GEMINI_API_KEY")
     pinecone_key = os.getenv("PINECONE_API_KEY")
     
-    if not gemini_key or not pinecone_key:
-        print("❌ Error: Missing API Keys in environment")
+    if not gemini_key:
+        print("❌ Error: Missing GEMINI_API_KEY in environment")
+        return None, None
+    if RETRIEVAL_BACKEND == "pinecone" and not pinecone_key:
+        print("❌ Error: RETRIEVAL_BACKEND=pinecone but PINECONE_API_KEY is missing")
         return None, None
 
     genai.configure(api_key=gemini_key)
-    pc = Pinecone(api_key=pinecone_key)
+    # Pinecone is optional with the local backend; it is kept in sync when a key is present
+    pc = Pinecone(api_key=pinecone_key) if pinecone_key else None
     return genai, pc
 
-def get_embedding(text):
-    try:
-        result = genai.embed_content(
-            model="models/text-embedding-004",
-            content=text,
-            task_type="retrieval_document"
+def get_pinecone_index(pc):
+    """Returns (index, created); a freshly created index needs a full ingestion."""
+    from pinecone import ServerlessSpec
+    
+    existing_indexes = pc.list_indexes().names()
+    if INDEX_NAME not in existing_indexes:
+        print(f"Creating index '{INDEX_NAME}'...")
+        pc.create_index(
+            name=INDEX_NAME,
+            dimension=EMBEDDING_DIM, # Gemini 004 dimension
+            metric="cosine",
+            spec=ServerlessSpec(
+                cloud="aws",
+                region="us-east-1"
+            ) 
         )
-        return result['embedding']
+        return pc.Index(INDEX_NAME), True
+    return pc.Index(INDEX_NAME), False
+
+# Changed chunks buffered between the source and embedding stages. When embedding
+# falls behind, the sources block instead of piling the corpus up in memory.
+PIPELINE_QUEUE_SIZE = 2 * EMBED_BATCH_SIZE * EMBED_CONCURRENCY
+UPSERT_BATCH_SIZE = 50
+
+_END_OF_SOURCES = object()
+
+def pinecone_ids(index):
+    """Every vector id in the Pinecone index, or None if the index cannot list (pod-based)."""
+    try:
+        return {vid for page in index.list() for vid in page}
     except Exception as e:
-        print(f"Embedding Error: {e}")
+        print(f"⚠️ Could not list Pinecone ids, falling back to the previous manifest: {e}")
         return None
 
-def main():
+def stale_after_full_rebuild(index, previous, seen, completed_stages, failed_parents, all_stages):
+    """
+    A full rebuild starts from an empty manifest, so removed() cannot see ids that no longer
+    exist. Diff what Pinecone holds (or the previous manifest lists) against this run instead,
+    with the same guards: only completed stages delete, failed documents are kept.
+    """
+    known = pinecone_ids(index)
+    if known is None:
+        known = set(previous.chunks)
+    stale = []
+    for cid in known:
+        if cid in seen or under_failed_parent(cid, failed_parents):
+            continue
+        entry = previous.chunks.get(cid)
+        # Ids the previous manifest never recorded have no known stage: only delete them
+        # when every stage completed
+        if (entry and entry["stage"] in completed_stages) or (not entry and completed_stages >= all_stages):
+            stale.append(cid)
+    return stale
+
+def run_sources(stages, manifest, out_queue, seen, completed_stages, failed_parents, errors, stop):
+    """
+    Source + chunk stages (runs in its own thread).
+    Pulls chunks from each ingestor generator, records every id it sees and forwards
+    only chunks whose content hash differs from the manifest. A stage counts as
+    completed (trusted to delete) only once its generator is exhausted and produced
+    chunks; documents it reports as SourceFailure are never deleted.
+    """
+    def put(item):
+        # Blocks while the queue is full, unless the consumer gave up
+        while not stop.is_set():
+            try:
+                out_queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    try:
+        for stage, label, ingest in stages:
+            print(f"\n{label}")
+            produced = False
+            for chunk in ingest() or []:
+                if stop.is_set():
+                    return
+                if isinstance(chunk, SourceFailure):
+                    failed_parents.add(chunk.parent)
+                    continue
+                produced = True
+                seen.add(chunk['id'])
+                content_hash = chunk_hash(chunk, EMBEDDING_MODEL)
+                if manifest.is_changed(chunk['id'], content_hash):
+                    put({**chunk, "stage": stage, "hash": content_hash})
+            if produced:
+                completed_stages.add(stage)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        put(_END_OF_SOURCES)
+
+def main(full=False, progress=None):
+    """
+    Syncs the vector index with the sources as a streaming pipeline:
+    sources -> chunk/diff -> embed -> upsert, connected by bounded queues.
+    Only chunks whose content hash changed since the last run are embedded and
+    upserted; chunks whose source disappeared are deleted. full=True re-embeds everything.
+    progress, if given, is called with the per-stage counters as they change.
+    Returns the final counters, or None if the services are not configured.
+    """
     print("🚀 Starting Knowledge Base Ingestion...")
     
     # Initialize services
     genai_client, pc = get_services()
-    if not genai_client or not pc:
+    if not genai_client:
         print("❌ Ingestion aborted due to missing services")
         return
 
-    all_chunks = []
+    # 1. Decide between incremental and full sync
+    index = None
+    if pc:
+        index, created = get_pinecone_index(pc)
+        full = full or created
     
-    # 1. Resume
-    print("\n📄 Processing Resume...")
-    all_chunks.extend(ingest_resume())
+    manifest = IngestManifest.load()
+    if manifest.index_version != read_index_version():
+        print("⚠️ Manifest does not match the local index, re-embedding everything")
+        full = True
+    # Kept for the Pinecone diff after a full rebuild
+    previous = manifest
+    if full:
+        manifest = IngestManifest()
     
-    # 2. Database (Projects, Skills, Blogs)
-    print("\n🗄️ Processing Database...")
-    all_chunks.extend(ingest_database())
+    # 2. Sources: Resume, Database (Projects, Skills, Blogs), GitHub
+    stages = [
+        ("resume", "📄 Processing Resume...", ingest_resume),
+        ("database", "🗄️ Processing Database...", ingest_database),
+        ("github", "🐙 Processing GitHub...", ingest_github),
+    ]
     
-    # 3. GitHub
-    print("\n🐙 Processing GitHub...")
-    all_chunks.extend(ingest_github())
+    changed_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    seen, completed_stages, failed_parents, errors = set(), set(), set(), []
+    stop = threading.Event()
+    source_thread = threading.Thread(
+        target=run_sources,
+        args=(stages, manifest, changed_queue, seen, completed_stages, failed_parents, errors, stop),
+        daemon=True
+    )
+    source_thread.start()
     
-    print(f"\nTotal Chunks to Ingest: {len(all_chunks)}")
+    def changed_chunks():
+        while True:
+            chunk = changed_queue.get()
+            if chunk is _END_OF_SOURCES:
+                return
+            yield chunk
     
-    # 4. Embed & Upsert
-    from pinecone import ServerlessSpec
+    # 3. Embed & Upsert the changed chunks as they arrive
+    # The local index is always maintained; Pinecone is updated too when configured.
+    local_index = LocalIndexWriter(keep_existing=not full)
+    vectors_to_upsert = []
+    stats = {"fetched": 0, "changed": 0, "embedded": 0, "upserted": 0, "removed": 0}
     
-    existing_indexes = pc.list_indexes().names()
-    if INDEX_NAME not in existing_indexes:
-        print(f"Creating index '{INDEX_NAME}'...")
-        pc.create_index(
-            name=INDEX_NAME,
-            dimension=768, # Gemini 004 dimension
-            metric="cosine",
-            spec=ServerlessSpec(
-                cloud="aws",
-                region="us-east-1"
-            ) 
-        )
+    def report():
+        stats["fetched"] = len(seen)
+        if progress:
+            progress(dict(stats))
     
-    index = pc.Index(INDEX_NAME)
+    print(f"\n✨ Embedding ({EMBED_CONCURRENCY} workers x {EMBED_BATCH_SIZE} per request) & Upserting while sources stream in...")
     
-    vectors_to_upsert = []
-    batch_size = 50
+    def flush():
+        local_index.upsert(vectors=vectors_to_upsert)
+        if index:
+            index.upsert(vectors=vectors_to_upsert)
+        stats["upserted"] += len(vectors_to_upsert)
+        print(f"   Upserted {stats['upserted']} vectors ({stats['changed']} changed chunks so far)")
+        vectors_to_upsert.clear()
+        report()
+    
+    try:
+        for chunk, embedding in embed_chunks(changed_chunks()):
+            cid = chunk['id']
+            stats["changed"] += 1
+            if embedding:
+                stats["embedded"] += 1
+                # Sanitize metadata: Pinecone doesn't allow None
+                clean_metadata = {k: (v if v is not None else "") for k, v in chunk['metadata'].items()}
+                
+                vectors_to_upsert.append({
+                    "id": cid,
+                    "values": embedding,
+                    "metadata": {
+                        "text": chunk['text'],
+                        **clean_metadata
+                    }
+                })
+                manifest.chunks[cid] = {"hash": chunk['hash'], "stage": chunk['stage']}
+                
+            # Batch Upsert
+            if len(vectors_to_upsert) >= UPSERT_BATCH_SIZE:
+                flush()
+            else:
+                report()
+        if vectors_to_upsert:
+            flush()
+        source_thread.join()
+        if errors:
+            raise errors[0]
+    except Exception:
+        stop.set()
+        local_index.discard()
+        raise
     
-    print("\n✨ Generating Embeddings & Upserting to Pinecone...")
+    # 4. Delete chunks whose source is gone
+    removed = manifest.removed(seen, completed_stages, failed_parents)
+    if failed_parents:
+        print(f"⚠️ {len(failed_parents)} documents failed to fetch; their existing chunks are kept")
+    if full and index:
+        # The local index is rebuilt from scratch; Pinecone still holds the old ids
+        removed = stale_after_full_rebuild(index, previous, seen, completed_stages, failed_parents,
+                                           {stage for stage, _, _ in stages})
+    stats["removed"] = len(removed)
+    report()
+    print(f"\nChunks: {len(seen)} | Changed: {stats['changed']} | Embedded: {stats['embedded']} | Removed: {len(removed)}")
     
-    for i, chunk in enumerate(all_chunks):
-        embedding = get_embedding(chunk['text'])
-        if embedding:
-            # Sanitize metadata: Pinecone doesn't allow None
-            clean_metadata = {k: (v if v is not None else "") for k, v in chunk['metadata'].items()}
-            
-            vectors_to_upsert.append({
-                "id": chunk['id'],
-                "values": embedding,
-                "metadata": {
-                    "text": chunk['text'],
-                    **clean_metadata
-                }
-            })
-            
-        # Batch Upsert
-        if len(vectors_to_upsert) >= batch_size or i == len(all_chunks) - 1:
-            if vectors_to_upsert:
-                index.upsert(vectors=vectors_to_upsert)
-                print(f"   Upserted batch {i+1}/{len(all_chunks)}")
-                vectors_to_upsert = []
+    if not stats["changed"] and not removed:
+        local_index.discard()
+        print("\n✅ Knowledge Base already up to date!")
+        return stats
+    
+    if removed:
+        print(f"\n🧹 Deleting {len(removed)} stale chunks...")
+        local_index.delete(ids=removed)
+        if index:
+            for start in range(0, len(removed), 1000):
+                index.delete(ids=removed[start:start + 1000])
+        for cid in removed:
+            manifest.chunks.pop(cid, None)
+
+    manifest.index_version = local_index.commit()
+    manifest.save()
 
     print("\n✅ Knowledge Base Update Complete!")
+    return stats
 
 if __name__ == "__main__":
-    main()
+    main(full="--full" in sys.argv)
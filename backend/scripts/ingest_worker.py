@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base ingestion worker.
+Runs queued ingestion jobs (see app/jobs.py) outside the web workers, so PDF parsing
+and embedding do not compete with request latency.
+
+Usage:
+    python scripts/ingest_worker.py          # Long-running: poll for jobs
+    python scripts/ingest_worker.py --once   # Run the next queued job (if any) and exit
+"""
+import os
+import sys
+import time
+import threading
+import traceback
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import SessionLocal, engine
+from app.models import schemas
+from app import jobs
+from scripts.ingest_v2 import main as run_ingestion
+
+POLL_INTERVAL_SECONDS = int(os.getenv("INGEST_WORKER_POLL_SECONDS", "5"))
+PROGRESS_INTERVAL_SECONDS = 2
+
+
+def keep_alive(job_id: int, done: threading.Event):
+    """
+    Refreshes the job's heartbeat every INGEST_HEARTBEAT_SECONDS until `done` is set.
+    Progress reports only happen when changed chunks are embedded, so a long run with
+    nothing changed would otherwise look dead and be failed by fail_stale_jobs.
+    """
+    db = SessionLocal()
+    try:
+        while not done.wait(jobs.INGEST_HEARTBEAT_SECONDS):
+            try:
+                jobs.heartbeat(db, job_id)
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Heartbeat for job #{job_id} failed: {e}")
+    finally:
+        db.close()
+
+
+def run_job(job_id: int, full: bool):
+    db = SessionLocal()
+    last_report = 0.0
+    done = threading.Event()
+    threading.Thread(target=keep_alive, args=(job_id, done), name="ingest-heartbeat", daemon=True).start()
+
+    def progress(stats):
+        nonlocal last_report
+        now = time.time()
+        if now - last_report >= PROGRESS_INTERVAL_SECONDS:
+            jobs.report_progress(db, job_id, stats)
+            last_report = now
+
+    try:
+        print(f"🛠️ Running ingestion job #{job_id} ({'full' if full else 'incremental'})")
+        stats = run_ingestion(full=full, progress=progress)
+        if stats is None:
+            raise RuntimeError("Ingestion aborted due to missing services")
+        jobs.report_progress(db, job_id, stats)
+        jobs.finish_job(db, job_id)
+        print(f"✅ Ingestion job #{job_id} completed")
+    except Exception as e:
+        traceback.print_exc()
+        db.rollback()
+        jobs.finish_job(db, job_id, error=str(e))
+        print(f"❌ Ingestion job #{job_id} failed: {e}")
+    finally:
+        done.set()
+        db.close()
+
+
+def run_next_job(worker: str) -> bool:
+    db = SessionLocal()
+    try:
+        job = jobs.claim_next_job(db, worker)
+        if not job:
+            return False
+        job_id, full = job.id, job.full
+    finally:
+        db.close()
+    run_job(job_id, full)
+    return True
+
+
+def main(once: bool = False):
+    schemas.Base.metadata.create_all(bind=engine)
+    worker = jobs.worker_id()
+    print(f"👷 Ingestion worker {worker} started")
+    while True:
+        ran = run_next_job(worker)
+        if once and not ran:
+            return
+        if not ran:
+            time.sleep(POLL_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main(once="--once" in sys.argv)
@@ -0,0 +1,112 @@
+import os
+import re
+
+# Budget per chunk, in estimated tokens (~4 characters per token for English text).
+# Small chunks keep embeddings focused and keep the chat prompt (top_k=5) short.
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "400"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "50"))
+
+MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+\S")
+# Resume PDFs have no markdown; their section titles are short upper-case lines
+UPPERCASE_HEADING = re.compile(r"^[A-Z][A-Z &/\-]{2,40}$")
+
+
+def estimate_tokens(text):
+    return (len(text) + 3) // 4
+
+
+def _slug(text):
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:40] or "section"
+
+
+def split_sections(text, heading_pattern=MARKDOWN_HEADING):
+    """Splits text at heading lines. Returns [(heading or None, body)]."""
+    sections = []
+    heading, lines = None, []
+    in_fence = False
+    for line in text.splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+        if not in_fence and heading_pattern.match(line.strip()):
+            if heading or any(l.strip() for l in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading, lines = line.strip(), []
+        else:
+            lines.append(line)
+    if heading or any(l.strip() for l in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return sections
+
+
+def _units(text, max_tokens):
+    """Paragraphs, falling back to lines and then words for anything still too large."""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            yield paragraph
+            continue
+        for line in paragraph.splitlines():
+            if estimate_tokens(line) <= max_tokens:
+                yield line
+                continue
+            current, length = [], 0
+            for word in line.split():
+                if current and estimate_tokens(" " * length + word) > max_tokens:
+                    yield " ".join(current)
+                    current, length = [], 0
+                current.append(word)
+                length += len(word) + 1
+            if current:
+                yield " ".join(current)
+
+
+def pack(text, max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS, separator="\n\n"):
+    """Greedily packs units into pieces of at most max_tokens, repeating a tail of ~overlap_tokens."""
+    pieces, current = [], []
+    for unit in _units(text, max_tokens):
+        if current and estimate_tokens(separator.join(current + [unit])) > max_tokens:
+            pieces.append(separator.join(current))
+            # Carry the trailing units that fit in the overlap budget into the next piece
+            tail = []
+            for prev in reversed(current):
+                if estimate_tokens(separator.join([prev] + tail + [unit])) > max_tokens or \
+                        estimate_tokens(separator.join([prev] + tail)) > overlap_tokens:
+                    break
+                tail.insert(0, prev)
+            current = tail
+        current.append(unit)
+    if current:
+        pieces.append(separator.join(current))
+    return pieces
+
+
+def chunk_document(base_id, text, metadata, header="", heading_pattern=MARKDOWN_HEADING,
+                   max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS, separator="\n\n"):
+    """
+    Splits a long source into heading-aware, token-bounded, overlapping chunks.
+
+    Every chunk repeats `header` (e.g. "# Blog Post: Title") and its section heading so
+    it stands on its own in the prompt. Ids are derived from the section heading and the
+    position inside that section ("{base_id}_{section}_{n}"), so editing one section
+    does not change the ids, and therefore the embeddings, of the others.
+    """
+    chunks = []
+    seen_sections = {}
+    for heading, body in split_sections(text, heading_pattern):
+        section = _slug(heading.lstrip("#").strip()) if heading else "intro"
+        seen_sections[section] = seen_sections.get(section, 0) + 1
+        if seen_sections[section] > 1:
+            section = f"{section}-{seen_sections[section]}"
+
+        prefix = "\n".join(part for part in (header, heading) if part)
+        budget = max(max_tokens - estimate_tokens(prefix), max_tokens // 2)
+        for n, piece in enumerate(pack(body, budget, overlap_tokens, separator)):
+            chunks.append({
+                "id": f"{base_id}_{section}_{n}",
+                "text": f"{prefix}\n{piece}".strip(),
+                "metadata": {**metadata, "parent": base_id, "section": heading or ""}
+            })
+    return chunks
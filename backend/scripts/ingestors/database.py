@@ -7,15 +7,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from scripts.ingestors.chunking import chunk_document
 
 def ingest_projects():
     db = SessionLocal()
-    projects = db.query(schemas.Project).all()
-    results = []
-    
-    for p in projects:
-        # Create a rich markdown description
-        content = f"""
+    try:
+        for p in db.query(schemas.Project).yield_per(50):
+            # Create a rich markdown description
+            content = f"""
 # Project: {p.title}
 Category: {p.category}
 Tech Stack: {", ".join(p.technologies) if p.technologies else "N/A"}
@@ -28,20 +27,20 @@ Date: {p.startDate} - {p.endDate if p.endDate else "Present"}
 Position: {p.position}
 Company: {p.company}
 Repository: {p.repository}
-        """.strip()
+            """.strip()
         
-        results.append({
-            "id": f"project_{p.id}",
-            "text": content,
-            "metadata": {
-                "source": "Database",
-                "type": "project",
-                "title": p.title,
-                "url": p.repository
+            yield {
+                "id": f"project_{p.id}",
+                "text": content,
+                "metadata": {
+                    "source": "Database",
+                    "type": "project",
+                    "title": p.title,
+                    "url": p.repository
+                }
             }
-        })
-    db.close()
-    return results
+    finally:
+        db.close()
 
 def ingest_skills():
     db = SessionLocal()
@@ -52,11 +51,11 @@ def ingest_skills():
         if s.category not in categories:
             categories[s.category] = []
         categories[s.category].append(f"{s.name} ({s.level})")
+    db.close()
     
-    results = []
     for cat, skill_list in categories.items():
         content = f"Sumit has the following skills in {cat}:\n- " + "\n- ".join(skill_list)
-        results.append({
+        yield {
             "id": f"skills_{cat}",
             "text": content,
             "metadata": {
@@ -64,36 +63,37 @@ def ingest_skills():
                 "type": "skills",
                 "title": f"Skills: {cat}"
             }
-        })
-    db.close()
-    return results
+        }
 
 def ingest_blogs():
     db = SessionLocal()
-    posts = db.query(schemas.BlogPost).filter(schemas.BlogPost.published == True).all()
-    results = []
-    
-    for post in posts:
-        # Markdown content is already rich
-        content = f"""
-# Blog Post: {post.title}
+    try:
+        # Stream posts from the cursor; only one post body is held at a time
+        posts = db.query(schemas.BlogPost).filter(schemas.BlogPost.published == True).yield_per(10)
+        for post in posts:
+            # Markdown content is already rich; split it along its headings
+            content = f"""
 Summary: {post.excerpt}
 Tags: {post.tags}
 
 {post.content}
-        """.strip()
+            """.strip()
         
-        results.append({
-            "id": f"blog_{post.slug}",
-            "text": content,
-            "metadata": {
-                "source": "Blog",
-                "type": "blog",
-                "title": post.title
-            }
-        })
-    db.close()
-    return results
+            yield from chunk_document(
+                f"blog_{post.slug}",
+                content,
+                {
+                    "source": "Blog",
+                    "type": "blog",
+                    "title": post.title
+                },
+                header=f"# Blog Post: {post.title}"
+            )
+    finally:
+        db.close()
 
 def ingest_database():
-    return ingest_projects() + ingest_skills() + ingest_blogs()
+    """Yields chunks for Projects, Skills and published Blog Posts."""
+    yield from ingest_projects()
+    yield from ingest_skills()
+    yield from ingest_blogs()
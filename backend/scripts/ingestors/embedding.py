@@ -0,0 +1,82 @@
+import os
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import google.generativeai as genai
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Texts per batchEmbedContents request (API maximum is 100)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "50"))
+# Batch requests in flight at once
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+EMBED_MAX_RETRIES = 5
+
+
+def _is_retryable(error):
+    """Quota (429) and transient server errors are worth retrying."""
+    code = getattr(error, "code", None)
+    if code in (429, 500, 503):
+        return True
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+                                    "InternalServerError", "DeadlineExceeded")
+
+
+def embed_batch(texts):
+    """One multi-content embedding request, retried with exponential backoff and jitter."""
+    for attempt in range(EMBED_MAX_RETRIES):
+        try:
+            result = genai.embed_content(
+                model=EMBEDDING_MODEL,
+                content=texts,
+                task_type="retrieval_document"
+            )
+            return result['embedding']
+        except Exception as e:
+            if attempt == EMBED_MAX_RETRIES - 1 or not _is_retryable(e):
+                raise
+            delay = min(30, 2 ** attempt) + random.uniform(0, 1)
+            print(f"   ⏳ Embedding quota/transient error, retrying in {delay:.1f}s: {e}")
+            time.sleep(delay)
+
+
+def embed_chunks(chunks, batch_size=EMBED_BATCH_SIZE, concurrency=EMBED_CONCURRENCY):
+    """
+    Embeds chunks in batched requests on a bounded pool of workers.
+    Yields (chunk, embedding) as each batch completes, so callers can upsert while
+    later batches are still in flight. A batch that keeps failing yields None embeddings.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        in_flight = {}
+
+        def collect(futures):
+            for future in futures:
+                batch = in_flight.pop(future)
+                try:
+                    embeddings = future.result()
+                except Exception as e:
+                    print(f"Embedding Error ({len(batch)} chunks): {e}")
+                    embeddings = [None] * len(batch)
+                yield from zip(batch, embeddings)
+
+        def submit(batch):
+            # Keep at most `concurrency` requests outstanding
+            while len(in_flight) >= concurrency:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+            in_flight[pool.submit(embed_batch, [c['text'] for c in batch])] = batch
+
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield from submit(batch)
+                batch = []
+            # Hand finished batches back while the source is still producing the next one
+            yield from collect([f for f in in_flight if f.done()])
+        if batch:
+            yield from submit(batch)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from collect(done)
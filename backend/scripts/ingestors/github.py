@@ -1,14 +1,28 @@
 
 import os
-import requests
 import re
 import sys
+import json
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from scripts.ingestors.chunking import chunk_document
+from scripts.ingestors.manifest import SourceFailure
+from app.vector_store import KB_DATA_DIR
+
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+GITHUB_CONCURRENCY = int(os.getenv("GITHUB_CONCURRENCY", "8"))
+# Concurrent requests allowed per host
+GITHUB_HOST_CONCURRENCY = {"api.github.com": 4, "default": 4}
+GITHUB_TIMEOUT = 15
+GITHUB_CACHE_PATH = os.path.join(KB_DATA_DIR, "github_http_cache.json")
 
 def get_project_urls_from_db():
     """
@@ -31,6 +45,10 @@ def get_project_urls_from_db():
     db.close()
     return github_projects
 
+class FetchError(Exception):
+    """A GitHub resource could not be fetched (network error, rate limit, 5xx); unlike 404 it may still exist."""
+
+
 def get_repo_details(url):
     """
     Extracts owner/repo from https://github.com/owner/repo
@@ -40,80 +58,182 @@ def get_repo_details(url):
         return match.group(1), match.group(2)
     return None, None
 
-def fetch_readme(owner, repo):
-    branches = ["main", "master"]
-    for branch in branches:
-        url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/README.md"
+class GitHubFetcher:
+    """
+    Pooled, conditional GitHub client.
+    - One requests.Session (keep-alive connection pool) with timeouts
+    - Per-host semaphores bound concurrent requests
+    - ETag/Last-Modified of every response are kept on disk, so unchanged resources
+      come back as 304 Not Modified (which also don't count against the API rate limit)
+    """
+
+    def __init__(self, cache_path=GITHUB_CACHE_PATH):
+        self.cache_path = cache_path
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=GITHUB_CONCURRENCY)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "smaxiso-portfolio-ingest"
+        self.host_limits = {host: threading.Semaphore(n) for host, n in GITHUB_HOST_CONCURRENCY.items()}
+        self.stats = {"fetched": 0, "not_modified": 0, "errors": 0}
+        self._lock = threading.Lock()
+        try:
+            with open(cache_path) as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+    def get(self, url, accept="application/vnd.github+json"):
+        """Returns the response body (from cache on 304), None on 404; raises FetchError otherwise."""
+        headers = {"Accept": accept}
+        if GITHUB_TOKEN and "api.github.com" in url:
+            headers["Authorization"] = f"token {GITHUB_TOKEN}"
+        cached = self.cache.get(url)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        host = urlparse(url).netloc
         try:
-            resp = requests.get(url)
+            with self.host_limits.get(host, self.host_limits["default"]):
+                resp = self.session.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+        except requests.RequestException as e:
+            print(f"Error fetching {url}: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+            raise FetchError(str(e))
+
+        with self._lock:
+            if resp.status_code == 304 and cached:
+                self.stats["not_modified"] += 1
+                return cached["body"]
             if resp.status_code == 200:
+                self.stats["fetched"] += 1
+                self.cache[url] = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "body": resp.text
+                }
                 return resp.text
-        except Exception as e:
-            print(f"Error fetching README for {repo}: {e}")
+            if resp.status_code == 404:
+                return None
+            self.stats["errors"] += 1
+        print(f"GitHub {resp.status_code} for {url}")
+        raise FetchError(f"GitHub {resp.status_code} for {url}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp = self.cache_path + ".tmp"
+        with self._lock, open(tmp, "w") as f:
+            json.dump(self.cache, f)
+        os.replace(tmp, self.cache_path)
+
+def fetch_default_branch(fetcher, owner, repo):
+    body = fetcher.get(f"https://api.github.com/repos/{owner}/{repo}")
+    if body:
+        return json.loads(body).get("default_branch", "main")
     return None
 
-def fetch_file_structure(owner, repo):
-    api_url = f"https://api.github.com/repos/{owner}/{repo}"
+def fetch_readme(fetcher, owner, repo):
+    # The readme endpoint resolves the file name (README.md, readme.rst, ...) on the default branch
+    return fetcher.get(f"https://api.github.com/repos/{owner}/{repo}/readme", accept="application/vnd.github.raw")
+
+def fetch_file_structure(fetcher, owner, repo, branch):
+    body = fetcher.get(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
+    if body:
+        tree_data = json.loads(body)
+        # Limit to first 200 files
+        files = [item['path'] for item in tree_data.get('tree', []) if item['type'] == 'blob']
+        return files[:200]
+    return []
+
+def ingest_repo(fetcher, p):
+    """Returns the repo's chunks plus SourceFailure markers for documents that failed to fetch."""
+    owner, repo_name = get_repo_details(p['url'])
+    if not owner or not repo_name:
+        return []
+
+    print(f"Processing GitHub: {repo_name}...")
+    chunks = []
+    readme_parent, tree_parent = f"github_readme_{repo_name}", f"github_tree_{repo_name}"
+
+    # Resolve the default branch once (repo metadata), then use it for the tree
     try:
-        resp = requests.get(api_url)
-        if resp.status_code == 200:
-            data = resp.json()
-            default_branch = data.get("default_branch", "main")
-            
-            # Get Tree
-            tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{default_branch}?recursive=1"
-            tree_resp = requests.get(tree_url)
-            if tree_resp.status_code == 200:
-                tree_data = tree_resp.json()
-                # Limit to first 200 files
-                files = [item['path'] for item in tree_data.get('tree', []) if item['type'] == 'blob']
-                return files[:200]
-    except Exception as e:
-        print(f"Error fetching tree for {repo}: {e}")
+        branch = fetch_default_branch(fetcher, owner, repo_name)
+    except FetchError:
+        return [SourceFailure(readme_parent), SourceFailure(tree_parent)]
+    if not branch:
+        return []
+
+    # 1. README
+    try:
+        readme_content = fetch_readme(fetcher, owner, repo_name)
+    except FetchError:
+        chunks.append(SourceFailure(readme_parent))
+        readme_content = None
+    if readme_content:
+        chunks.extend(chunk_document(
+            readme_parent,
+            readme_content,
+            {
+                "source": "GitHub",
+                "type": "readme",
+                "title": p['name'],
+                "url": p['url']
+            },
+            header=f"# Project: {p['name']}\n## GitHub README"
+        ))
         
-    return []
+    # 2. Structure
+    try:
+        files = fetch_file_structure(fetcher, owner, repo_name, branch)
+    except FetchError:
+        chunks.append(SourceFailure(tree_parent))
+        files = []
+    if files:
+        structure_str = "\n".join(files)
+        chunks.extend(chunk_document(
+            tree_parent,
+            structure_str,
+            {
+                "source": "GitHub",
+                "type": "structure",
+                "title": p['name'],
+                "url": p['url']
+            },
+            header=f"# Project: {p['name']}\n## File Structure\nThe following files exist in the repository:",
+            separator="\n"
+        ))
+
+    return chunks
 
 def ingest_github():
+    """
+    Yields README and file tree chunks of every project repository. Several repos are
+    fetched at a time, but at most GITHUB_CONCURRENCY results are held before the
+    consumer takes them.
+    """
     print("🐙 Fetching Project URLs from Database...")
     projects = get_project_urls_from_db()
-    chunks = []
     
     print(f"Found {len(projects)} GitHub projects in the Database.")
+    projects = iter(projects)
     
-    for p in projects:
-        owner, repo_name = get_repo_details(p['url'])
-        if not owner or not repo_name:
-            continue
-            
-        print(f"Processing GitHub: {repo_name}...")
-        
-        # 1. README
-        readme_content = fetch_readme(owner, repo_name)
-        if readme_content:
-            chunks.append({
-                "id": f"github_readme_{repo_name}",
-                "text": f"# Project: {p['name']}\n## GitHub README\n{readme_content}",
-                "metadata": {
-                    "source": "GitHub",
-                    "type": "readme",
-                    "title": p['name'],
-                    "url": p['url']
-                }
-            })
-            
-        # 2. Structure
-        files = fetch_file_structure(owner, repo_name)
-        if files:
-            structure_str = "\n".join(files)
-            chunks.append({
-                "id": f"github_tree_{repo_name}",
-                "text": f"# Project: {p['name']}\n## File Structure\nThe following files exist in the repository:\n{structure_str}",
-                "metadata": {
-                    "source": "GitHub",
-                    "type": "structure",
-                    "title": p['name'],
-                    "url": p['url']
-                }
-            })
-            
-    return chunks
+    fetcher = GitHubFetcher()
+    with ThreadPoolExecutor(max_workers=GITHUB_CONCURRENCY) as pool:
+        in_flight = set()
+        while True:
+            for p in projects:
+                in_flight.add(pool.submit(ingest_repo, fetcher, p))
+                if len(in_flight) >= GITHUB_CONCURRENCY:
+                    break
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    fetcher.save()
+    
+    print(f"GitHub requests: {fetcher.stats['fetched']} fetched, "
+          f"{fetcher.stats['not_modified']} not modified (304), {fetcher.stats['errors']} errors")
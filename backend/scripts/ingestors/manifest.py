@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import hashlib
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from app.vector_store import KB_DATA_DIR
+
+MANIFEST_PATH = os.path.join(KB_DATA_DIR, "ingest_manifest.json")
+
+
+def chunk_hash(chunk, model):
+    """Content hash of everything that ends up in the vector record."""
+    payload = json.dumps(
+        {"model": model, "text": chunk["text"], "metadata": chunk["metadata"]},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SourceFailure:
+    """
+    Yielded by an ingestor in place of the chunks of a document it could not fetch
+    (rate limit, timeout, 5xx). Chunks under `parent` are kept rather than deleted.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+
+
+class IngestManifest:
+    """
+    Per-chunk content hashes of what is currently in the vector index, with the
+    ingestion stage ('resume', 'database', 'github') that produced each chunk.
+    Tied to the local index version it was written with: if the index was rebuilt
+    or removed behind its back, the manifest is ignored and everything is re-embedded.
+    """
+
+    def __init__(self, index_version=None, chunks=None):
+        self.index_version = index_version
+        self.chunks = chunks or {}  # chunk_id -> {"hash": ..., "stage": ...}
+
+    @classmethod
+    def load(cls, path=MANIFEST_PATH):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(data.get("index_version"), data.get("chunks", {}))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path=MANIFEST_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"index_version": self.index_version, "chunks": self.chunks}, f)
+        os.replace(tmp, path)
+
+    def is_changed(self, chunk_id, content_hash):
+        entry = self.chunks.get(chunk_id)
+        return not entry or entry["hash"] != content_hash
+
+    def removed(self, seen_ids, completed_stages, failed_parents=()):
+        """
+        Chunks in the manifest that their stage no longer produces. Only stages that ran
+        to the end and produced something (e.g. not GitHub unreachable) are trusted to
+        delete, and never chunks of a document that failed to fetch this run.
+        """
+        return [
+            cid for cid, entry in self.chunks.items()
+            if cid not in seen_ids and entry["stage"] in completed_stages
+            and not under_failed_parent(cid, failed_parents)
+        ]
+
+
+def under_failed_parent(chunk_id, failed_parents):
+    # Chunk ids are "{parent}_{section}_{n}" (see chunking.chunk_document)
+    return any(chunk_id == parent or chunk_id.startswith(parent + "_") for parent in failed_parents)
@@ -10,6 +10,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from scripts.ingestors.chunking import chunk_document, UPPERCASE_HEADING
 
 def get_resume_url_from_db():
     db = SessionLocal()
@@ -85,10 +86,12 @@ def ingest_resume(file_path="frontend/public/assets/sumit_kumar.pdf"):
     else:
         print("❌ No valid remote Resume URL found in Database.")
 
+    return chunks
+
 
 def extract_text_from_pdf(pdf_path):
     """
-    Extract text from PDF as a SINGLE chunk (memory-efficient for Render)
+    Extract text from PDF, split into section-aware chunks (Experience, Skills, ...)
     """
     try:
         reader = PdfReader(pdf_path)
@@ -99,15 +102,17 @@ def extract_text_from_pdf(pdf_path):
                 full_text += t + "\n\n"
             
         if full_text.strip():
-            return [{
-                "id": "resume_full_pdf",
-                "text": full_text.strip(),
-                "metadata": {
+            return chunk_document(
+                "resume",
+                full_text.strip(),
+                {
                     "source": "Resume PDF",
                     "type": "resume",
                     "title": "Sumit Kumar Resume"
-                }
-            }]
+                },
+                header="# Sumit Kumar Resume",
+                heading_pattern=UPPERCASE_HEADING
+            )
     except Exception as e:
         print(f"Error parsing PDF {pdf_path}: {e}")
         
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Run database migration to add the blog listing index (published, created_at, id)
+used by keyset pagination of /api/v1/blog/.
+Usage: python scripts/migrate_blog_list_index.py
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import SessionLocal
+
+
+def run_migration():
+    """Add ix_blog_posts_published_created to blog_posts (no-op if it exists)"""
+    db = SessionLocal()
+    try:
+        print("Creating index 'ix_blog_posts_published_created' on blog_posts...")
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_blog_posts_published_created
+            ON blog_posts (published, created_at, id)
+        """))
+        db.commit()
+
+        print("✓ Migration completed successfully!")
+        print("  - Index: ix_blog_posts_published_created (published, created_at, id)")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Blog listing index")
+    print("=" * 60)
+    print()
+
+    database_url = os.getenv("DATABASE_URL")
+    display_url = database_url.split("@")[1] if database_url and "@" in database_url else "local SQLite"
+    print(f"Database: {display_url}")
+    print()
+
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"\n✗ Migration failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Run database migration to add the denormalized reaction columns to blog_posts
+(reaction_total, reaction_counts), the index behind /api/v1/blog/?sort=popular,
+and backfill both columns from blog_reactions.
+Usage: python scripts/migrate_blog_reaction_totals.py
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect, text
+from app.database import SessionLocal, engine
+from app.models import schemas
+from app.reaction_counter import refresh_post_totals
+from app import http_cache
+
+
+def run_migration():
+    """Add reaction_total / reaction_counts to blog_posts, index them and backfill"""
+    db = SessionLocal()
+    try:
+        existing = {c["name"] for c in inspect(engine).get_columns("blog_posts")}
+
+        if "reaction_total" in existing:
+            print("✓ Column 'reaction_total' already exists. Skipping.")
+        else:
+            print("Adding 'reaction_total' column to blog_posts table...")
+            db.execute(text("ALTER TABLE blog_posts ADD COLUMN reaction_total INTEGER NOT NULL DEFAULT 0"))
+
+        if "reaction_counts" in existing:
+            print("✓ Column 'reaction_counts' already exists. Skipping.")
+        else:
+            print("Adding 'reaction_counts' column to blog_posts table...")
+            db.execute(text("ALTER TABLE blog_posts ADD COLUMN reaction_counts JSON"))
+
+        print("Creating index 'ix_blog_posts_published_popular' on blog_posts...")
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_blog_posts_published_popular
+            ON blog_posts (published, reaction_total, created_at, id)
+        """))
+        db.commit()
+
+        print("Backfilling reaction totals from blog_reactions...")
+        slugs = [slug for (slug,) in db.query(schemas.BlogPost.slug)]
+        if slugs:
+            refresh_post_totals(db, slugs)
+            http_cache.bump(db, http_cache.REACTION_TOTALS)
+        db.commit()
+
+        print("✓ Migration completed successfully!")
+        print("  - Added columns: reaction_total (INTEGER, default: 0), reaction_counts (JSON)")
+        print("  - Index: ix_blog_posts_published_popular (published, reaction_total, created_at, id)")
+        print(f"  - Backfilled {len(slugs)} posts")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Blog reaction totals")
+    print("=" * 60)
+    print()
+
+    database_url = os.getenv("DATABASE_URL")
+    display_url = database_url.split("@")[1] if database_url and "@" in database_url else "local SQLite"
+    print(f"Database: {display_url}")
+    print()
+
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"\n✗ Migration failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Run database migration for the guestbook moderation queue:
+- guestbook.created_at becomes a real timestamp (was an ISO string)
+- index ix_guestbook_approved_created (approved, created_at DESC, id DESC) used by
+  keyset pagination of /api/v1/guestbook/ and /api/v1/guestbook/all
+Usage: python scripts/migrate_guestbook_queue.py
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect, text
+from app.database import SessionLocal, engine
+
+
+def convert_created_at(db):
+    """ISO strings -> TIMESTAMP. Missing values get the migration time."""
+    column = next(c for c in inspect(engine).get_columns("guestbook") if c["name"] == "created_at")
+    dialect = engine.dialect.name
+
+    if dialect == "postgresql":
+        if "TIMESTAMP" in str(column["type"]).upper():
+            print("✓ Column 'created_at' is already a timestamp. Skipping conversion.")
+            return
+        print("Converting guestbook.created_at to TIMESTAMP...")
+        db.execute(text("""
+            ALTER TABLE guestbook
+            ALTER COLUMN created_at TYPE TIMESTAMP USING NULLIF(created_at, '')::timestamp
+        """))
+        db.execute(text("UPDATE guestbook SET created_at = now() AT TIME ZONE 'utc' WHERE created_at IS NULL"))
+        db.execute(text("ALTER TABLE guestbook ALTER COLUMN created_at SET NOT NULL"))
+    else:
+        # SQLite keeps DATETIME values as text; rewrite them in the format SQLAlchemy reads back
+        print("Normalizing guestbook.created_at values...")
+        db.execute(text("UPDATE guestbook SET created_at = replace(created_at, 'T', ' ') WHERE created_at LIKE '%T%'"))
+        db.execute(text("UPDATE guestbook SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL OR created_at = ''"))
+
+
+def run_migration():
+    """Convert guestbook.created_at and add ix_guestbook_approved_created (no-op if done)"""
+    db = SessionLocal()
+    try:
+        convert_created_at(db)
+
+        print("Creating index 'ix_guestbook_approved_created' on guestbook...")
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_guestbook_approved_created
+            ON guestbook (approved, created_at DESC, id DESC)
+        """))
+        db.commit()
+
+        print("✓ Migration completed successfully!")
+        print("  - Column: created_at (TIMESTAMP)")
+        print("  - Index: ix_guestbook_approved_created (approved, created_at DESC, id DESC)")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Guestbook moderation queue")
+    print("=" * 60)
+    print()
+
+    database_url = os.getenv("DATABASE_URL")
+    display_url = database_url.split("@")[1] if database_url and "@" in database_url else "local SQLite"
+    print(f"Database: {display_url}")
+    print()
+
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"\n✗ Migration failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Run database migration to add ix_ingestion_jobs_single_active, the partial unique index
+that allows at most one queued or running row in ingestion_jobs.
+Usage: python scripts/migrate_ingestion_single_flight.py
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import SessionLocal
+from app import jobs
+from app.timestamps import utcnow
+
+
+def run_migration():
+    """Fail duplicate active jobs, then add ix_ingestion_jobs_single_active (no-op if it exists)"""
+    db = SessionLocal()
+    try:
+        jobs.fail_stale_jobs(db)
+
+        # The index cannot be created while more than one job is active: keep the newest
+        active = db.query(jobs.Job).filter(jobs.Job.status.in_(jobs.ACTIVE_STATUSES)).order_by(jobs.Job.id.desc()).all()
+        for job in active[1:]:
+            print(f"Failing duplicate active job #{job.id} ({job.status})...")
+            job.status = "failed"
+            job.error = "Superseded by a newer job"
+            job.finished_at = utcnow()
+        db.commit()
+
+        print("Creating index 'ix_ingestion_jobs_single_active' on ingestion_jobs...")
+        db.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ix_ingestion_jobs_single_active
+            ON ingestion_jobs ((status IN ('queued', 'running')))
+            WHERE status IN ('queued', 'running')
+        """))
+        db.commit()
+
+        print("✓ Migration completed successfully!")
+        print("  - Index: ix_ingestion_jobs_single_active (unique, WHERE status IN ('queued', 'running'))")
+        print(f"  - Failed {max(len(active) - 1, 0)} duplicate active jobs")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Database Migration: Ingestion single-flight index")
+    print("=" * 60)
+    print()
+
+    database_url = os.getenv("DATABASE_URL")
+    display_url = database_url.split("@")[1] if database_url and "@" in database_url else "local SQLite"
+    print(f"Database: {display_url}")
+    print()
+
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"\n✗ Migration failed with error: {e}")
+        sys.exit(1)
@@ -6,6 +6,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.database import SessionLocal
 from app.models.schemas import Experience, Project, Skill
+from app import http_cache
 
 db = SessionLocal()
 
@@ -58,6 +59,7 @@ Engineered an **agentic pricing pipeline** utilizing a custom **SP-API SDK** (Si
             existing_p.description = data["description"]
             existing_p.technologies = data["technologies"]
 
+    http_cache.bump(db, Experience, Project)
     db.commit()
     print("Database updated successfully with reorganized domain layout.")
 
@@ -3,6 +3,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def refine_content():
     db = SessionLocal()
@@ -80,6 +81,7 @@ Antigravity is looking like a solid addition to my toolkit, especially for rapid
 *Huge thanks to Dazbo (Darren Lester) for the [original deep-dive article](https://medium.com/google-cloud/working-with-google-antigravity-in-wsl-2b2df077a28e) that helped me figure this out.*"""
         
         post.content = new_content
+        http_cache.bump(db, schemas.BlogPost)
         db.commit()
         print("Content refined successfully")
         
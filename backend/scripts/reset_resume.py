@@ -1,5 +1,6 @@
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def reset_resume():
     db = SessionLocal()
@@ -7,6 +8,7 @@ def reset_resume():
         config = db.query(schemas.SiteConfig).filter(schemas.SiteConfig.id == 1).first()
         if config:
             config.resume_url = "/assets/sumit_kumar.pdf"
+            http_cache.bump(db, schemas.SiteConfig)
             db.commit()
             print("✅ Resume URL reset to: /assets/resume.pdf")
         else:
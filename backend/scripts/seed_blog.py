@@ -1,12 +1,13 @@
 import sys
 import os
-from datetime import datetime
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
+from app.timestamps import utcnow
 
 def seed_post():
     db = SessionLocal()
@@ -106,10 +107,11 @@ Antigravity is looking like a solid addition to my toolkit, especially for rapid
             tags=tags,
             cover_image="https://res.cloudinary.com/dnggn7f7b/image/upload/v1734192419/project_cli_tool_cover_1765728459865.png", # Reusing a techy cover image I know exists or generic
             published=True,
-            created_at=datetime.utcnow().isoformat()
+            created_at=utcnow().isoformat()
         )
         db.add(new_post)
     
+    http_cache.bump(db, schemas.BlogPost)
     db.commit()
     print("Success!")
     db.close()
@@ -1,5 +1,6 @@
 from app.database import SessionLocal, engine
 from app.models import schemas, pydantic_models
+from app import http_cache
 
 def seed_config():
     db = SessionLocal()
@@ -32,6 +33,7 @@ def seed_config():
             footer_text="© 2024 Sumit. All rights reserved."
         )
         db.add(config)
+        http_cache.bump(db, schemas.SiteConfig)
         db.commit()
     else:
         print("SiteConfig already exists.")
@@ -55,6 +57,7 @@ def seed_config():
             db_social = schemas.SocialLink(**social, is_active=1)
             db.add(db_social)
     
+    http_cache.bump(db, schemas.SocialLink)
     db.commit()
     db.close()
     print("Seeding complete!")
@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine
 from app.models import schemas
+from app import http_cache
 
 # Create tables if they don't exist (safety check)
 schemas.Base.metadata.create_all(bind=engine)
@@ -48,6 +49,7 @@ def seed_data():
                                     website=p.get('website')
                                 )
                                 db.add(db_project)
+                http_cache.bump(db, schemas.Project)
                 db.commit()
                 print("Projects seeded!")
 
@@ -72,6 +74,7 @@ def seed_data():
                                     level=s.get('level')
                                 )
                                 db.add(db_skill)
+                http_cache.bump(db, schemas.Skill)
                 db.commit()
                 print("Skills seeded!")
 
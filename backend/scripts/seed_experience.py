@@ -7,6 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.database import SessionLocal
 from app.models.schemas import Experience
+from app import http_cache
 
 def seed_experience():
     db = SessionLocal()
@@ -84,6 +85,7 @@ def seed_experience():
             else:
                 print(f"Skipped (Exists): {exp_data['company']}")
 
+        http_cache.bump(db, Experience)
         db.commit()
         print("Done!")
 
@@ -7,6 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def parse_project_urls(file_path="project_urls.txt"):
     """
@@ -74,6 +75,7 @@ def sync_db():
             print(f"⚠️ Warning: Project '{project_name}' not found in database.")
             
     if updated_count > 0:
+        http_cache.bump(db, schemas.Project)
         db.commit()
         print(f"\n✅ Successfully updated {updated_count} projects in the database.")
     else:
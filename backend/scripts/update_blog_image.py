@@ -3,6 +3,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 
 def update_image():
     db = SessionLocal()
@@ -11,6 +12,7 @@ def update_image():
         # Using a reliable placeholder if I can't find the exact one, or a known working one
         # Let's use a nice tech gradient or a generic unsplash one for "code"
         post.cover_image = "https://images.unsplash.com/photo-1629654297299-c8506221ca97?q=80&w=2574&auto=format&fit=crop" 
+        http_cache.bump(db, schemas.BlogPost)
         db.commit()
         print("Updated cover image")
     else:
@@ -1,5 +1,6 @@
 from app.database import SessionLocal
 from app.models import schemas
+from app import http_cache
 import json
 
 def update_cocoblu_role():
@@ -55,6 +56,7 @@ def update_cocoblu_role():
             cocoblu_exists.end_date = None
             cocoblu_exists.order = 0
 
+        http_cache.bump(db, schemas.SiteConfig, schemas.Experience)
         db.commit()
         print("Success: Database updated for Cocoblu role.")
     except Exception as e:
@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.database import SessionLocal
 from app.models.schemas import Experience
+from app import http_cache
 
 db = SessionLocal()
 
@@ -33,6 +34,7 @@ Built an on-demand merchant reporting pipeline integrating robust authentication
         nit.title = "Data Science Research Intern"
         nit.description = "Developed a real-time forest fire detection system utilizing Python-based machine learning algorithms and fuzzy logic."
 
+    http_cache.bump(db, Experience)
     db.commit()
     print("Database Experiences fully synchronized with resume!")
 
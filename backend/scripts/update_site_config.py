@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.database import SessionLocal
 from app.models.schemas import SiteConfig
+from app import http_cache
 
 db = SessionLocal()
 
@@ -31,6 +32,7 @@ def run():
     config.projects_completed = 19
     config.show_work_badge = True
 
+    http_cache.bump(db, SiteConfig)
     db.commit()
     print("Database SiteConfig updated successfully!")
 
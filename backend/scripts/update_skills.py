@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.database import SessionLocal
 from app.models.schemas import Skill
+from app import http_cache
 
 db = SessionLocal()
 
@@ -54,6 +55,7 @@ def run():
     ]
     
     db.add_all(new_skills)
+    http_cache.bump(db, Skill)
     db.commit()
     print("Database Skills fully synchronized with resume!")
 
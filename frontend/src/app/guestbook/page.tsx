@@ -45,7 +45,7 @@ export default function GuestbookPage() {
             setMessage("");
         } catch (error) {
             console.error(error);
-            toast.error("Failed to submit entry");
+            toast.error(error instanceof Error ? error.message : "Failed to submit entry");
         } finally {
             setSubmitting(false);
         }
@@ -98,6 +98,7 @@ export default function GuestbookPage() {
                                             value={name}
                                             onChange={(e) => setName(e.target.value)}
                                             required
+                                            maxLength={80}
                                             placeholder="Your Name"
                                             className="w-full bg-black/20 border border-white/10 rounded-lg px-4 py-3 focus:outline-none focus:border-blue-500/50 focus:ring-1 focus:ring-blue-500/50 transition-colors"
                                         />
@@ -110,6 +111,7 @@ export default function GuestbookPage() {
                                             value={message}
                                             onChange={(e) => setMessage(e.target.value)}
                                             required
+                                            maxLength={2000}
                                             placeholder="Your Message..."
                                             className="w-full bg-black/20 border border-white/10 rounded-lg px-4 py-3 focus:outline-none focus:border-purple-500/50 focus:ring-1 focus:ring-purple-500/50 transition-colors"
                                         />
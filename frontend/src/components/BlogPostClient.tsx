@@ -7,7 +7,7 @@ import { useScroll, useMotionValueEvent, motion } from 'framer-motion';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 import { getPostBySlug, getPublishedPosts } from '@/lib/api';
-import { BlogPost } from '@/types';
+import { BlogPost, BlogPostSummary } from '@/types';
 import { formatInTimeZone } from 'date-fns-tz';
 import { ArrowLeft, Calendar, Clock, Tag, History as HistoryIcon, Share2, Copy, Check } from 'lucide-react';
 import { Prism as SyntaxHighlighter } from 'react-syntax-highlighter';
@@ -70,7 +70,7 @@ function CodeBlock({ code, language }: { code: string; language?: string }) {
 export default function BlogPostClient({ slug, initialPost }: { slug: string; initialPost?: BlogPost }) {
     const router = useRouter();
     const [post, setPost] = useState<BlogPost | null>(initialPost || null);
-    const [relatedPosts, setRelatedPosts] = useState<BlogPost[]>([]);
+    const [relatedPosts, setRelatedPosts] = useState<BlogPostSummary[]>([]);
     const [loading, setLoading] = useState(!initialPost); // Only show loading if no initial data
 
     // Navbar Visibility Logic (Replicated from Navbar.tsx to sync position)
@@ -70,6 +70,12 @@ export default function ChatWidget() {
                 }),
             });
 
+            if (response.status === 429) {
+                const retryAfter = response.headers.get("Retry-After");
+                const wait = retryAfter ? `${retryAfter} seconds` : "a moment";
+                setMessages(prev => [...prev, { role: "assistant", content: `You're sending messages a little too fast. Please wait ${wait} and try again.` }]);
+                return;
+            }
             if (!response.ok) throw new Error("Failed to fetch");
             if (!response.body) throw new Error("No response body");
 
@@ -2,8 +2,8 @@
 
 import { useState, useEffect } from 'react';
 import { useRouter, useSearchParams } from 'next/navigation';
-import { BlogPost } from '@/types';
-import { getAllPosts, createPost, updatePost, deletePost } from '@/lib/api';
+import { BlogPost, BlogPostSummary } from '@/types';
+import { getAllPosts, getPostForEditing, createPost, updatePost, deletePost } from '@/lib/api';
 import { useAuth } from '@/context/AuthContext';
 import { uploadFile } from '@/lib/cloudinary';
 import { Trash2, Edit, Plus, FileText, Check, X, Eye, AlertCircle } from 'lucide-react';
@@ -17,7 +17,7 @@ export function BlogEditor() {
     const { token } = useAuth();
 
     // State Hooks - MUST be first
-    const [posts, setPosts] = useState<BlogPost[]>([]);
+    const [posts, setPosts] = useState<BlogPostSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [isEditing, setIsEditing] = useState(false);
     const [uploading, setUploading] = useState(false);
@@ -79,32 +79,48 @@ export function BlogEditor() {
 
             // If we have posts loaded, try to find the post
             if (posts.length > 0 || idParam === 'new') {
-                const draftKey = `blog_draft_${idParam || 'new'}`;
-                const savedDraft = localStorage.getItem(draftKey);
-
-                let basePost = initialPostState;
-
-                if (idParam && idParam !== 'new') {
-                    const found = posts.find(p => p.id === parseInt(idParam));
-                    if (found) basePost = found;
-                }
-
-                // Conflict Resolution: Draft > DB
-                if (savedDraft) {
-                    try {
-                        const parsed = JSON.parse(savedDraft);
-                        setCurrentPost(parsed);
-                        if (JSON.stringify(parsed) !== JSON.stringify(basePost)) {
-                            toast('Restored unsaved draft', { icon: '📂' });
+                let cancelled = false;
+
+                const restore = async () => {
+                    const draftKey = `blog_draft_${idParam || 'new'}`;
+                    const savedDraft = localStorage.getItem(draftKey);
+
+                    let basePost: Partial<BlogPost> = initialPostState;
+
+                    if (idParam && idParam !== 'new') {
+                        const found = posts.find(p => p.id === parseInt(idParam));
+                        if (found) {
+                            // The list only has summaries; load the full post (with content) to edit
+                            try {
+                                basePost = await getPostForEditing(found.id);
+                            } catch (e) {
+                                toast.error('Failed to load post content');
+                                basePost = { ...found, content: '' };
+                            }
                         }
-                    } catch (e) {
+                    }
+                    if (cancelled) return;
+
+                    // Conflict Resolution: Draft > DB
+                    if (savedDraft) {
+                        try {
+                            const parsed = JSON.parse(savedDraft);
+                            setCurrentPost(parsed);
+                            if (JSON.stringify(parsed) !== JSON.stringify(basePost)) {
+                                toast('Restored unsaved draft', { icon: '📂' });
+                            }
+                        } catch (e) {
+                            setCurrentPost(basePost);
+                        }
+                    } else {
                         setCurrentPost(basePost);
                     }
-                } else {
-                    setCurrentPost(basePost);
-                }
 
-                setOriginalPost(basePost);
+                    setOriginalPost(basePost);
+                };
+
+                restore();
+                return () => { cancelled = true; };
             }
         } else {
             setIsEditing(false);
@@ -193,7 +209,7 @@ export function BlogEditor() {
         }
     };
 
-    const openEditor = (post?: BlogPost) => {
+    const openEditor = (post?: BlogPostSummary) => {
         // Just push URL, useEffect handles the rest
         const id = post ? post.id : 'new';
         router.push(`?mode=editor&id=${id}`);
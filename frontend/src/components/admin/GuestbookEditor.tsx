@@ -2,7 +2,7 @@
 
 import { useState, useEffect } from "react";
 import { useAuth } from "@/context/AuthContext";
-import { getAllGuestbookEntries, approveGuestbookEntry, deleteGuestbookEntry } from "@/lib/api";
+import { getAllGuestbookEntries, approveGuestbookEntry, approveGuestbookEntries, deleteGuestbookEntry, deleteGuestbookEntries } from "@/lib/api";
 import { GuestbookEntry } from "@/types";
 import { toast } from "react-hot-toast";
 import { Loader2, Check, Trash2, Clock } from "lucide-react";
@@ -13,12 +13,18 @@ export function GuestbookEditor() {
     const [entries, setEntries] = useState<GuestbookEntry[]>([]);
     const [loading, setLoading] = useState(true);
     const [processingId, setProcessingId] = useState<number | null>(null);
+    const [approvingAll, setApprovingAll] = useState(false);
+    const [selected, setSelected] = useState<Set<number>>(new Set());
+    const [deletingSelected, setDeletingSelected] = useState(false);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const fetchEntries = async () => {
         if (!token) return;
         try {
-            const data = await getAllGuestbookEntries(token);
-            setEntries(data);
+            const page = await getAllGuestbookEntries(token);
+            setEntries(page.entries);
+            setNextCursor(page.nextCursor);
         } catch (error) {
             console.error(error);
             toast.error("Failed to load guestbook entries");
@@ -27,6 +33,21 @@ export function GuestbookEditor() {
         }
     };
 
+    const loadMore = async () => {
+        if (!token || !nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await getAllGuestbookEntries(token, nextCursor);
+            setEntries([...entries, ...page.entries]);
+            setNextCursor(page.nextCursor);
+        } catch (error) {
+            console.error(error);
+            toast.error("Failed to load more entries");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         fetchEntries();
     }, [token]);
@@ -46,6 +67,62 @@ export function GuestbookEditor() {
         }
     };
 
+    const handleApproveAll = async () => {
+        if (!token) return;
+        const pendingIds = entries.filter(e => e.approved === 0).map(e => e.id);
+        if (pendingIds.length === 0) return;
+        if (!confirm(`Approve ${nextCursor ? 'the' : 'all'} ${pendingIds.length} pending entries${nextCursor ? ' loaded so far' : ''}?`)) return;
+
+        setApprovingAll(true);
+        try {
+            // The bulk endpoint takes up to 500 ids per call
+            let approved = 0;
+            for (let i = 0; i < pendingIds.length; i += 500) {
+                approved += (await approveGuestbookEntries(pendingIds.slice(i, i + 500), token)).approved;
+            }
+            toast.success(`${approved} entries approved!`);
+            fetchEntries(); // Refresh
+        } catch (error) {
+            console.error(error);
+            toast.error("Failed to approve entries");
+        } finally {
+            setApprovingAll(false);
+        }
+    };
+
+    const toggleSelected = (id: number) => {
+        const next = new Set(selected);
+        if (next.has(id)) next.delete(id); else next.add(id);
+        setSelected(next);
+    };
+
+    const toggleAll = () => {
+        setSelected(selected.size === entries.length ? new Set() : new Set(entries.map(e => e.id)));
+    };
+
+    const handleDeleteSelected = async () => {
+        if (!token || selected.size === 0) return;
+        if (!confirm(`Delete ${selected.size} selected entries?`)) return;
+
+        setDeletingSelected(true);
+        try {
+            // The bulk endpoint takes up to 500 ids per call
+            const ids = Array.from(selected);
+            let deleted = 0;
+            for (let i = 0; i < ids.length; i += 500) {
+                deleted += (await deleteGuestbookEntries(ids.slice(i, i + 500), token)).deleted;
+            }
+            toast.success(`${deleted} entries deleted`);
+            setEntries(entries.filter(e => !selected.has(e.id)));
+            setSelected(new Set());
+        } catch (error) {
+            console.error(error);
+            toast.error("Failed to delete entries");
+        } finally {
+            setDeletingSelected(false);
+        }
+    };
+
     const handleDelete = async (id: number) => {
         if (!token) return;
         if (!confirm("Are you sure you want to delete this entry?")) return;
@@ -55,6 +132,11 @@ export function GuestbookEditor() {
             await deleteGuestbookEntry(id, token);
             toast.success("Entry deleted");
             setEntries(entries.filter(e => e.id !== id));
+            if (selected.has(id)) {
+                const next = new Set(selected);
+                next.delete(id);
+                setSelected(next);
+            }
         } catch (error) {
             console.error(error);
             toast.error("Failed to delete entry");
@@ -69,8 +151,28 @@ export function GuestbookEditor() {
         <div className="bg-white p-6 rounded-xl shadow-sm border">
             <h2 className="text-xl font-bold mb-6 flex items-center justify-between">
                 <span>Guestbook Management</span>
-                <span className="text-sm font-normal text-gray-500 bg-gray-100 px-3 py-1 rounded-full">
-                    {entries.filter(e => e.approved === 0).length} Pending
+                <span className="flex items-center gap-2">
+                    {selected.size > 0 && (
+                        <button
+                            onClick={handleDeleteSelected}
+                            disabled={deletingSelected}
+                            className="flex items-center gap-1 text-sm font-medium text-red-500 hover:bg-red-50 px-3 py-1 rounded-full transition-colors disabled:opacity-50"
+                        >
+                            {deletingSelected ? <Loader2 className="animate-spin w-4 h-4" /> : <Trash2 className="w-4 h-4" />} Delete selected ({selected.size})
+                        </button>
+                    )}
+                    {entries.some(e => e.approved === 0) && (
+                        <button
+                            onClick={handleApproveAll}
+                            disabled={approvingAll}
+                            className="flex items-center gap-1 text-sm font-medium text-green-600 hover:bg-green-50 px-3 py-1 rounded-full transition-colors disabled:opacity-50"
+                        >
+                            {approvingAll ? <Loader2 className="animate-spin w-4 h-4" /> : <Check className="w-4 h-4" />} Approve all
+                        </button>
+                    )}
+                    <span className="text-sm font-normal text-gray-500 bg-gray-100 px-3 py-1 rounded-full">
+                        {entries.filter(e => e.approved === 0).length} Pending
+                    </span>
                 </span>
             </h2>
 
@@ -78,6 +180,14 @@ export function GuestbookEditor() {
                 <table className="w-full text-left border-collapse">
                     <thead>
                         <tr className="border-b text-gray-500 text-sm">
+                            <th className="py-3 px-4">
+                                <input
+                                    type="checkbox"
+                                    checked={entries.length > 0 && selected.size === entries.length}
+                                    onChange={toggleAll}
+                                    aria-label="Select all entries"
+                                />
+                            </th>
                             <th className="py-3 px-4">Status</th>
                             <th className="py-3 px-4">Name</th>
                             <th className="py-3 px-4">Message</th>
@@ -88,13 +198,21 @@ export function GuestbookEditor() {
                     <tbody>
                         {entries.length === 0 ? (
                             <tr>
-                                <td colSpan={5} className="py-8 text-center text-gray-400">
+                                <td colSpan={6} className="py-8 text-center text-gray-400">
                                     No entries found.
                                 </td>
                             </tr>
                         ) : (
                             entries.map((entry) => (
                                 <tr key={entry.id} className="border-b last:border-0 hover:bg-gray-50">
+                                    <td className="py-3 px-4">
+                                        <input
+                                            type="checkbox"
+                                            checked={selected.has(entry.id)}
+                                            onChange={() => toggleSelected(entry.id)}
+                                            aria-label={`Select entry from ${entry.name}`}
+                                        />
+                                    </td>
                                     <td className="py-3 px-4">
                                         {entry.approved === 1 ? (
                                             <span className="flex items-center gap-1 text-green-600 bg-green-50 px-2 py-0.5 rounded text-xs font-medium w-fit">
@@ -141,6 +259,18 @@ export function GuestbookEditor() {
                     </tbody>
                 </table>
             </div>
+
+            {nextCursor && (
+                <div className="mt-4 text-center">
+                    <button
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="inline-flex items-center gap-1 text-sm font-medium text-gray-600 hover:bg-gray-100 px-4 py-2 rounded-full transition-colors disabled:opacity-50"
+                    >
+                        {loadingMore && <Loader2 className="animate-spin w-4 h-4" />} Load more
+                    </button>
+                </div>
+            )}
         </div>
     );
 }
@@ -37,7 +37,7 @@ export default function MediaManager() {
             setSelected(new Set()); // Clear selection on refresh
         } catch (error) {
             console.error(error);
-            showToast('Failed to audit media', 'error');
+            showToast(error instanceof Error ? error.message : 'Failed to audit media', 'error');
         } finally {
             setLoading(false);
         }
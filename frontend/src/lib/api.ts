@@ -1,4 +1,4 @@
-import { Project, Skill, Hobby, GuestbookEntry, BlogPost, Experience } from "@/types";
+import { Project, Skill, Hobby, GuestbookEntry, BlogPost, BlogPostSummary, Experience } from "@/types";
 import { getAuth } from "firebase/auth";
 
 export interface SiteConfig {
@@ -240,15 +240,19 @@ export async function submitGuestbookEntry(entry: { name: string, message: strin
         },
         body: JSON.stringify(entry),
     });
-    if (!res.ok) throw new Error('Failed to submit entry');
+    if (!res.ok) {
+        // Spam / duplicate / flood rejections carry a readable detail
+        const body = await res.json().catch(() => null);
+        throw new Error(typeof body?.detail === 'string' ? body.detail : 'Failed to submit entry');
+    }
     return res.json();
 }
 
 
 
 // Blog
-export async function getPublishedPosts(): Promise<BlogPost[]> {
-    const res = await fetchWithFailover(`/blog/`);
+export async function getPublishedPosts(sort: 'recent' | 'popular' = 'recent'): Promise<BlogPostSummary[]> {
+    const res = await fetchWithFailover(sort === 'popular' ? `/blog/?sort=popular` : `/blog/`);
     if (!res.ok) throw new Error('Failed to fetch posts');
     return res.json();
 }
@@ -262,18 +266,40 @@ export async function getPostBySlug(slug: string): Promise<BlogPost> {
     return res.json();
 }
 
-export async function getAllPosts(): Promise<BlogPost[]> {
+// Admin editor: full post by id, authenticated and never served from the HTTP cache
+export async function getPostForEditing(id: number): Promise<BlogPost> {
     const auth = getAuth();
     const token = await auth.currentUser?.getIdToken();
-    const res = await fetchWithFailover(`/blog/admin/all`, {
+    const res = await fetchWithFailover(`/blog/admin/${id}`, {
         headers: {
             'Authorization': `Bearer ${token}`
-        }
+        },
+        cache: 'no-store'
     });
-    if (!res.ok) throw new Error('Failed to fetch all posts');
+    if (!res.ok) throw new Error('Failed to fetch post');
     return res.json();
 }
 
+// The admin listing is paged; follow X-Next-Cursor until every post (incl. drafts) is loaded
+export async function getAllPosts(): Promise<BlogPostSummary[]> {
+    const auth = getAuth();
+    const token = await auth.currentUser?.getIdToken();
+    const posts: BlogPostSummary[] = [];
+    let cursor: string | null = null;
+    do {
+        const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+        const res = await fetchWithFailover(`/blog/admin/all${query}`, {
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+        if (!res.ok) throw new Error('Failed to fetch all posts');
+        posts.push(...await res.json());
+        cursor = res.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return posts;
+}
+
 export async function createPost(post: Omit<BlogPost, 'id' | 'created_at'>): Promise<BlogPost> {
     const auth = getAuth();
     const token = await auth.currentUser?.getIdToken();
@@ -317,12 +343,14 @@ export async function deletePost(id: number): Promise<void> {
 }
 
 // Admin Guestbook
-export async function getAllGuestbookEntries(token: string): Promise<GuestbookEntry[]> {
-    const res = await fetchWithFailover(`/guestbook/all`, {
+// One page of the moderation queue (pending first); nextCursor is null on the last page
+export async function getAllGuestbookEntries(token: string, cursor?: string | null): Promise<{ entries: GuestbookEntry[]; nextCursor: string | null }> {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const res = await fetchWithFailover(`/guestbook/all${query}`, {
         headers: { 'Authorization': `Bearer ${token}` }
     });
     if (!res.ok) throw new Error('Failed to fetch all entries');
-    return res.json();
+    return { entries: await res.json(), nextCursor: res.headers.get('X-Next-Cursor') };
 }
 
 export async function approveGuestbookEntry(id: number, token: string): Promise<GuestbookEntry> {
@@ -336,6 +364,32 @@ export async function approveGuestbookEntry(id: number, token: string): Promise<
     return res.json();
 }
 
+export async function approveGuestbookEntries(ids: number[], token: string): Promise<{ approved: number }> {
+    const res = await fetchWithFailover(`/guestbook/bulk/approve`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify({ ids }),
+    });
+    if (!res.ok) throw new Error('Failed to approve entries');
+    return res.json();
+}
+
+export async function deleteGuestbookEntries(ids: number[], token: string): Promise<{ deleted: number }> {
+    const res = await fetchWithFailover(`/guestbook/bulk/delete`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify({ ids }),
+    });
+    if (!res.ok) throw new Error('Failed to delete entries');
+    return res.json();
+}
+
 export async function deleteGuestbookEntry(id: number, token: string): Promise<void> {
     const res = await fetchWithFailover(`/guestbook/${id}`, {
         method: 'DELETE',
@@ -351,7 +405,11 @@ export async function auditMedia(token: string): Promise<MediaResource[]> {
     const res = await fetchWithFailover(`/media/audit`, {
         headers: { 'Authorization': `Bearer ${token}` }
     });
-    if (!res.ok) throw new Error('Failed to audit media');
+    if (!res.ok) {
+        // 503 while the inventory's first sync or the reference backfill is pending
+        const body = await res.json().catch(() => null);
+        throw new Error(typeof body?.detail === 'string' ? body.detail : 'Failed to audit media');
+    }
     return res.json();
 }
 
@@ -51,6 +51,12 @@ export interface BlogPost {
     updated_at?: string;
 }
 
+// List views (/blog/, /blog/admin/all) omit the Markdown body and carry reaction totals
+export type BlogPostSummary = Omit<BlogPost, 'content'> & {
+    reaction_total?: number | null;
+    reaction_counts?: Record<string, number> | null;
+};
+
 export interface Experience {
     id: number;
     company: string;